@@ -0,0 +1,49 @@
+# Mikro-Benchmark: CSV-Aufbau für den Verlauf-Chart (iterrows + String-Verkettung vs. dataframe_to_csv)
+# Aufruf: python bench/bench_csv.py [anzahl_zeitpunkte ...]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from luftqualitaet.csvio import dataframe_to_csv  # noqa: E402
+
+CITIES = ["Berlin", "Hamburg", "Munich", "Cologne", "Frankfurt", "Stuttgart", "Düsseldorf", "Dortmund", "Essen", "Leipzig"]
+
+
+def make_pivot(n_timestamps):
+    rng = np.random.default_rng(42)
+    index = pd.date_range("2024-01-01", periods=n_timestamps, freq="3h", name="timestamp")
+    values = rng.integers(10, 150, size=(n_timestamps, len(CITIES))).astype(float)
+    values[rng.random(values.shape) < 0.05] = np.nan
+    return pd.DataFrame(values, index=index, columns=pd.Index(CITIES, name="city"))
+
+
+def iterrows_csv(pivot):
+    # Bisheriges Verfahren aus create_aqi_timeline_chart
+    pivot = pivot.reset_index().astype(object).fillna("")
+    csv_data = ",".join(pivot.columns) + "\n"
+    for _, row in pivot.iterrows():
+        csv_data += ",".join(str(val) for val in row.values) + "\n"
+    return csv_data
+
+
+def measure(fn, pivot, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(pivot)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    print(f"{'Zeitpunkte':>10} {'iterrows':>10} {'to_csv':>10} {'Faktor':>8}")
+    for n in sizes:
+        pivot = make_pivot(n)
+        old = measure(iterrows_csv, pivot, repeat=1 if n > 50_000 else 3)
+        new = measure(lambda p: dataframe_to_csv(p, index=True), pivot)
+        print(f"{n:>10} {old:>9.3f}s {new:>9.3f}s {old / new:>7.1f}x")
@@ -0,0 +1,50 @@
+# Benchmark: AQI-Raster (IDW) nach Rasterbreite und Anzahl der Stationen, getrennt nach Interpolation und PNG
+# Aufruf: python bench/bench_grid.py [--widths 128 256 512 1024] [--stations 10 40 131 1000] [--level 6]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from luftqualitaet.grid import BOUNDS, colorize, encode_png, grid_points, idw  # noqa: E402
+
+
+def stations(n, seed=42):
+    rng = np.random.default_rng(seed)
+    south, west, north, east = BOUNDS
+    return rng.uniform(south, north, n), rng.uniform(west, east, n), rng.integers(10, 180, n).astype(float)
+
+
+def measure(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des AQI-Rasters")
+    parser.add_argument("--widths", type=int, nargs="+", default=[128, 256, 512, 1024])
+    parser.add_argument("--stations", type=int, nargs="+", default=[10, 40, 131, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--level", type=int, default=6, help="zlib-Stufe des PNG-Encoders")
+    args = parser.parse_args()
+
+    print(f"{'Breite':>6} {'Höhe':>5} {'Stationen':>9} {'IDW':>9} {'PNG':>9} {'Gesamt':>9} {'Größe':>9}")
+    for width in args.widths:
+        lats, lons = grid_points(width)
+        for n in args.stations:
+            station_lats, station_lons, values = stations(n)
+            (estimate, nearest), idw_seconds = measure(
+                lambda: idw(lats, lons, station_lats, station_lons, values), args.repeat)
+            png, png_seconds = measure(lambda: encode_png(colorize(estimate, nearest), args.level), args.repeat)
+            print(f"{width:>6} {len(lats):>5} {n:>9} {idw_seconds:>8.3f}s {png_seconds:>8.3f}s "
+                  f"{idw_seconds + png_seconds:>8.3f}s {len(png) / 1024:>6.0f}KiB")
+
+
+if __name__ == "__main__":
+    main()
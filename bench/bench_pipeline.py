@@ -0,0 +1,177 @@
+# End-to-End-Benchmark: kompletter Lauf (python -m luftqualitaet) gegen lokale Stub-Server
+# Aufruf: python bench/bench_pipeline.py --cities 10 50 200 --history-days 30 --runs 5
+#         [--latency 0.05] [--error-rate 0.01] [--rate-limit 20] [--json ergebnis.json]
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+from luftqualitaet.history import COLUMNS, HistoryStore  # noqa: E402
+from stubs import StubSettings, start_stub  # noqa: E402
+
+PIPELINE_STAGES = ["sammeln", "statistik", "veröffentlichen", "rendern", "zusammenfassung", "zeitreihen", "raster"]
+
+
+def city_names(n):
+    return [f"Stadt{i:04d}" for i in range(n)]
+
+
+# Synthetische Messhistorie: alle 18 Minuten ein Wert pro Stadt
+def seed_history(path, cities, days):
+    if days <= 0:
+        return 0
+    rng = np.random.default_rng(42)
+    end = pd.Timestamp.now().floor("min") - pd.Timedelta(minutes=18)
+    timestamps = pd.date_range(end=end, periods=days * 80, freq="18min")
+    df = pd.DataFrame({
+        "timestamp": np.repeat(timestamps.values, len(cities)),
+        "city": np.tile(cities, len(timestamps)),
+    })
+    for col in COLUMNS[2:]:
+        df[col] = rng.uniform(1, 150, len(df)).round(2)
+    HistoryStore(path).append(df)
+    return len(df)
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    # Nearest-Rank-Verfahren
+    return values[min(len(values) - 1, max(0, math.ceil(q / 100 * len(values)) - 1))]
+
+
+# Ein Lauf als eigener Prozess, damit Peak-RSS und Metriken pro Lauf sauber getrennt sind
+def run_pipeline(workdir, env, verbose):
+    log = open(os.path.join(workdir, "run.log"), "ab")
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "luftqualitaet"], cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - start
+    log.close()
+    if process.returncode != 0 or verbose:
+        with open(os.path.join(workdir, "run.log"), encoding="utf-8", errors="replace") as f:
+            print(f.read()[-3000:])
+    if process.returncode != 0:
+        raise RuntimeError(f"Lauf fehlgeschlagen (Exit-Code {process.returncode})")
+
+    with open(os.path.join(workdir, "metrics.json"), encoding="utf-8") as f:
+        metrics = json.load(f)
+    result = {"gesamt": elapsed, "peak_rss_mb": usage.ru_maxrss / 1024, "retries": 0, "http_errors": 0, "fetched": 0}
+    for gauge in metrics["gauges"]:
+        if gauge["name"] == "stage_last_seconds":
+            result[gauge["labels"]["stage"]] = gauge["value"]
+    for summary in metrics["summaries"]:
+        # Aufbereitung des Verlaufs (pandas) separat ausweisen
+        if summary["name"] == "chart_stage_seconds" and summary["labels"] == {"chart": "timeline", "stage": "aufbereiten"}:
+            result["verlauf aufbereiten"] = summary["sum"]
+    for counter in metrics["counters"]:
+        if counter["name"] == "http_retries_total":
+            result["retries"] += counter["value"]
+        elif counter["name"] == "http_requests_total" and not counter["labels"]["status"].startswith("2"):
+            result["http_errors"] += counter["value"]
+        elif counter["name"] == "ninjas_cache_misses_total":
+            result["fetched"] += counter["value"]
+    return result
+
+
+def bench(n_cities, history_days, runs, warmup, urls, verbose):
+    workdir = tempfile.mkdtemp(prefix="lq-bench-")
+    try:
+        cities = city_names(n_cities)
+        rows = seed_history(os.path.join(workdir, "data", "history"), cities, history_days)
+        env = dict(os.environ)
+        env.update({
+            "PYTHONPATH": ROOT + os.pathsep + env.get("PYTHONPATH", ""),
+            "CITIES": ",".join(cities),
+            "NINJAS_BASE_URL": urls["ninjas"],
+            "DATAWRAPPER_BASE_URL": urls["datawrapper"],
+            "OPENROUTER_BASE_URL": urls["openrouter"],
+            "NINJA_API_KEY": "bench",
+            "DATAWRAPPER_API_TOKEN": "bench",
+            "OPENROUTER_API_KEY": "bench",
+        })
+        # Jeder Lauf soll alle Städte abrufen: ohne Mindestabstand (TTL) und mit einem Sammeltakt von 1 s,
+        # sonst sind die Städte nach dem Aufwärmen bis COLLECT_INTERVAL (1080 s) nicht mehr fällig.
+        # Die Stubs liefern bei jedem Abruf neue Zufallswerte, damit auch das Veröffentlichen gemessen wird.
+        env.setdefault("NINJA_CACHE_TTL", "0")
+        env.setdefault("COLLECT_INTERVAL", "1")
+
+        results = []
+        for i in range(warmup + runs):
+            result = run_pipeline(workdir, env, verbose)
+            if result["fetched"] < n_cities:
+                print(f"⚠️ Lauf {i + 1}: nur {result['fetched']}/{n_cities} Städte abgerufen")
+            if i >= warmup:
+                results.append(result)
+        return rows, results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def report(n_cities, history_days, rows, results):
+    print(f"▶ {n_cities} Städte, {history_days} Tage Verlauf ({rows} Zeilen), {len(results)} Läufe")
+    summary = {"cities": n_cities, "history_days": history_days, "history_rows": rows, "runs": len(results), "stages": {}}
+    for name in ["gesamt"] + PIPELINE_STAGES + ["verlauf aufbereiten"]:
+        values = [r[name] for r in results if name in r]
+        if not values:
+            continue
+        p50, p95 = percentile(values, 50), percentile(values, 95)
+        summary["stages"][name] = {"p50": p50, "p95": p95}
+        print(f"   {name:<22} p50 {p50:7.3f} s   p95 {p95:7.3f} s")
+    collect_p50 = summary["stages"].get("sammeln", {}).get("p50")
+    summary["cities_per_second"] = n_cities / collect_p50 if collect_p50 else None
+    summary["runs_per_minute"] = 60 / summary["stages"]["gesamt"]["p50"]
+    summary["peak_rss_mb"] = max(r["peak_rss_mb"] for r in results)
+    summary["retries"] = sum(r["retries"] for r in results)
+    summary["http_errors"] = sum(r["http_errors"] for r in results)
+    throughput = f"{summary['cities_per_second']:.1f} Städte/s beim Sammeln, " if summary["cities_per_second"] else ""
+    print(f"   Durchsatz: {throughput}{summary['runs_per_minute']:.1f} Läufe/min")
+    print(f"   Peak-RSS {summary['peak_rss_mb']:.0f} MB, {summary['retries']} Wiederholungen, {summary['http_errors']} Fehlerantworten")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-End-Benchmark gegen lokale Stub-Server")
+    parser.add_argument("--cities", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--history-days", type=int, nargs="+", default=[7])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1, help="Läufe, die nicht gezählt werden (z.B. Neuaufbau des Verlaufs)")
+    parser.add_argument("--latency", type=float, default=0.02, help="mittlere Antwortzeit der Stubs in Sekunden")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil der Anfragen mit Status 500")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Anfragen pro Sekunde je Stub, darüber 429")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--json", help="Ergebnisse zusätzlich als JSON speichern")
+    parser.add_argument("--verbose", action="store_true", help="Ausgabe der Läufe anzeigen")
+    args = parser.parse_args()
+
+    urls = {}
+    for api in ["ninjas", "datawrapper", "openrouter"]:
+        settings = StubSettings(args.latency, args.error_rate, args.rate_limit, args.retry_after)
+        _, urls[api] = start_stub(api, settings)
+
+    summaries = []
+    for history_days in args.history_days:
+        for n_cities in args.cities:
+            rows, results = bench(n_cities, history_days, args.runs, args.warmup, urls, args.verbose)
+            summaries.append(report(n_cities, history_days, rows, results))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Benchmark: Erzeugung der Zeitreihen-Shards (Neuaufbau und inkrementeller Lauf) je Länge der Historie
+# Aufruf: python bench/bench_series.py [--cities 10] [--history-days 30 180 365]
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Ausgabeordner muss vor dem Import der Konfiguration feststehen
+WORKDIR = tempfile.mkdtemp(prefix="lq-series-")
+os.environ["OUTPUT_DIR"] = os.path.join(WORKDIR, "site")
+
+sys.path.insert(0, os.path.dirname(__file__))
+from bench_pipeline import city_names, seed_history  # noqa: E402
+from luftqualitaet.history import COLUMNS, HistoryStore  # noqa: E402
+from luftqualitaet.series import SERIES_DIR, write_series  # noqa: E402
+from luftqualitaet.output import output_path  # noqa: E402
+
+
+def tree_size(path):
+    files = plain = gz = 0
+    for directory, _, names in os.walk(path):
+        for name in names:
+            size = os.path.getsize(os.path.join(directory, name))
+            if name.endswith(".gz"):
+                gz += size
+            elif not name.endswith(".br"):
+                files += 1
+                plain += size
+    return files, plain, gz
+
+
+# Ein weiterer Sammellauf: ein neuer Wert pro Stadt 18 Minuten nach dem letzten
+def append_run(store, cities):
+    last = store.read(start=pd.Timestamp.now() - pd.Timedelta(days=1), columns=["timestamp"])["timestamp"].max()
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({"timestamp": last + pd.Timedelta(minutes=18), "city": cities})
+    for col in COLUMNS[2:]:
+        df[col] = rng.uniform(1, 150, len(df)).round(2)
+    store.append(df)
+
+
+def bench(n_cities, history_days):
+    root = os.path.join(WORKDIR, f"history-{n_cities}-{history_days}")
+    cities = city_names(n_cities)
+    rows = seed_history(root, cities, history_days)
+    store = HistoryStore(root)
+    for day in store.days():
+        store.compact(day)
+    shutil.rmtree(output_path(SERIES_DIR), ignore_errors=True)
+
+    start = time.perf_counter()
+    write_series(store, rebuild=True)
+    full = time.perf_counter() - start
+    files, plain, gz = tree_size(output_path(SERIES_DIR))
+
+    append_run(store, cities)
+    start = time.perf_counter()
+    write_series(store)
+    incremental = time.perf_counter() - start
+
+    start = time.perf_counter()
+    write_series(store)
+    unchanged = time.perf_counter() - start
+    shutil.rmtree(root, ignore_errors=True)
+    return rows, full, incremental, unchanged, files, plain, gz
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Zeitreihen-Shards")
+    parser.add_argument("--cities", type=int, nargs="+", default=[10])
+    parser.add_argument("--history-days", type=int, nargs="+", default=[30, 180, 365])
+    args = parser.parse_args()
+
+    results = []
+    try:
+        for n_cities in args.cities:
+            for history_days in args.history_days:
+                results.append((n_cities, history_days) + bench(n_cities, history_days))
+    finally:
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+    print(f"{'Städte':>6} {'Tage':>5} {'Zeilen':>10} {'Neuaufbau':>10} {'inkrementell':>12} {'unverändert':>11} "
+          f"{'Shards':>7} {'JSON':>9} {'gzip':>9}")
+    for n_cities, days, rows, full, incremental, unchanged, files, plain, gz in results:
+        print(f"{n_cities:>6} {days:>5} {rows:>10} {full:>9.2f}s {incremental:>11.2f}s {unchanged:>10.3f}s "
+              f"{files:>7} {plain / 1024:>7.0f}KiB {gz / 1024:>7.0f}KiB")
+
+
+if __name__ == "__main__":
+    main()
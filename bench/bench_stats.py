@@ -0,0 +1,77 @@
+# Benchmark: Statistik (Tageskennzahlen, gleitende Mittel, Grenzwertüberschreitungen) mit Millionen Zeilen
+# Aufruf: python bench/bench_stats.py [--cities 130] [--history-days 30 365]
+import argparse
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(__file__))
+from bench_pipeline import city_names, seed_history  # noqa: E402
+from luftqualitaet.history import COLUMNS, HistoryStore  # noqa: E402
+from luftqualitaet.stats import StatsState, summarize  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+# Ein weiterer Sammellauf: ein neuer Wert pro Stadt 18 Minuten nach dem letzten
+def append_run(store, cities, last):
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({"timestamp": last + pd.Timedelta(minutes=18), "city": cities})
+    for col in COLUMNS[2:]:
+        df[col] = rng.uniform(1, 150, len(df)).round(2)
+    store.append(df)
+
+
+def bench(workdir, n_cities, history_days):
+    root = os.path.join(workdir, f"history-{n_cities}-{history_days}")
+    cities = city_names(n_cities)
+    rows = seed_history(root, cities, history_days)
+    store = HistoryStore(root)
+    for day in store.days():
+        store.compact(day)
+
+    state = StatsState(os.path.join(workdir, f"stats-{n_cities}-{history_days}", "daily.parquet"))
+    _, rebuild = timed(lambda: state.rebuild(store))
+    _, summary = timed(lambda: summarize(state.daily, store, state.watermark))
+    append_run(store, cities, state.watermark)
+    _, incremental = timed(lambda: state.update(store))
+    _, unchanged = timed(lambda: state.update(store))
+    shutil.rmtree(root, ignore_errors=True)
+    return rows, rebuild, incremental, unchanged, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Statistik")
+    parser.add_argument("--cities", type=int, nargs="+", default=[130])
+    parser.add_argument("--history-days", type=int, nargs="+", default=[30, 365])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lq-stats-")
+    results = []
+    try:
+        for n_cities in args.cities:
+            for history_days in args.history_days:
+                results.append((n_cities, history_days) + bench(workdir, n_cities, history_days))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{'Städte':>6} {'Tage':>5} {'Zeilen':>10} {'Neuaufbau':>10} {'Zeilen/s':>11} {'inkrementell':>12} "
+          f"{'unverändert':>11} {'Zusammenfassung':>15}")
+    for n_cities, days, rows, rebuild, incremental, unchanged, summary in results:
+        print(f"{n_cities:>6} {days:>5} {rows:>10} {rebuild:>9.2f}s {rows / rebuild:>11,.0f} {incremental:>11.3f}s "
+              f"{unchanged:>10.3f}s {summary:>14.3f}s")
+    print(f"Peak-RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
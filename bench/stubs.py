@@ -0,0 +1,141 @@
+# Lokale Stand-ins für API Ninjas, Datawrapper v3 und OpenRouter
+# Latenz, Fehlerquote und Rate-Limit (429 mit Retry-After) sind pro Server einstellbar.
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubSettings:
+    def __init__(self, latency=0.0, error_rate=0.0, rate_limit=None, retry_after=1):
+        # latency: mittlere Antwortzeit in Sekunden (±50 % Streuung)
+        # error_rate: Anteil der Anfragen, die mit 500 beantwortet werden
+        # rate_limit: erlaubte Anfragen pro Sekunde, darüber 429
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.tokens = rate_limit or 0
+        self.updated = time.monotonic()
+        self.counts = {}
+
+    def count(self, status):
+        with self.lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+    def limited(self):
+        if not self.rate_limit:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate_limit, self.tokens + (now - self.updated) * self.rate_limit)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return False
+            return True
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    settings = None
+    chart_ids = itertools.count(1)
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload=None, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.settings.count(status)
+
+    def _handle(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        settings = self.settings
+        if settings.latency:
+            time.sleep(settings.latency * random.uniform(0.5, 1.5))
+        if settings.limited():
+            return self._send(429, {"error": "rate limited"}, {"Retry-After": str(settings.retry_after)})
+        if settings.error_rate and random.random() < settings.error_rate:
+            return self._send(500, {"error": "stub error"})
+        status, payload = self.route(method, self.path.split("?")[0])
+        self._send(status, payload)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+
+class NinjasHandler(StubHandler):
+    def route(self, method, path):
+        if method == "GET" and path == "/v1/airquality":
+            def pollutant():
+                return {"concentration": round(random.uniform(1, 80), 2), "aqi": random.randint(5, 120)}
+
+            return 200, {
+                "overall_aqi": random.randint(10, 150),
+                "PM2.5": pollutant(), "PM10": pollutant(), "CO": pollutant(),
+                "NO2": pollutant(), "SO2": pollutant(), "O3": pollutant(),
+            }
+        return 404, {"error": "not found"}
+
+
+class DatawrapperHandler(StubHandler):
+    def route(self, method, path):
+        parts = path.strip("/").split("/")
+        if parts[:2] != ["v3", "charts"]:
+            return 404, {"error": "not found"}
+        if len(parts) == 2:
+            if method == "POST":
+                return 201, {"id": f"stub{next(self.chart_ids):05d}"}
+            return 200, {"list": [], "total": 0}
+        chart_id = parts[2]
+        if len(parts) == 4 and parts[3] == "data" and method == "PUT":
+            return 204, None
+        if len(parts) == 4 and parts[3] == "publish" and method == "POST":
+            return 200, {"data": {"publicUrl": f"https://datawrapper.dwcdn.net/{chart_id}/1/"}}
+        if len(parts) == 3 and method == "PATCH":
+            return 200, {"id": chart_id}
+        return 404, {"error": "not found"}
+
+
+class OpenRouterHandler(StubHandler):
+    def route(self, method, path):
+        if method == "POST" and path.endswith("/chat/completions"):
+            return 200, {"choices": [{"message": {"content": "Stub-Zusammenfassung der Luftqualität."}}]}
+        return 404, {"error": "not found"}
+
+
+HANDLERS = {
+    "ninjas": NinjasHandler,
+    "datawrapper": DatawrapperHandler,
+    "openrouter": OpenRouterHandler,
+}
+
+
+# Startet einen Stub-Server im Hintergrund; liefert (server, base_url)
+def start_stub(api, settings=None):
+    handler = type(f"{api}_handler", (HANDLERS[api],), {"settings": settings or StubSettings()})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
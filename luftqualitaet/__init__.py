@@ -0,0 +1 @@
+# Hilfsmodule für den Luftqualitäts-Tracker (datawrapper.py)
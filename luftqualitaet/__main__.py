@@ -0,0 +1,3 @@
+from luftqualitaet.main import main
+
+main()
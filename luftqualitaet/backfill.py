@@ -0,0 +1,194 @@
+import argparse
+import gzip
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from luftqualitaet.config import HISTORY_PATH, STATS_STATE_PATH, TIMELINE_STATE_PATH
+from luftqualitaet.history import COLUMNS, HistoryStore
+
+
+# Import historischer Archive (CSV/JSON/JSON Lines, auch .gz) in die Parquet-Historie.
+# Ein Prozesspool liest die Dateien in Blöcken und schreibt jeden Block als eigenes Segment;
+# doppelte (timestamp, city) entfernt anschließend die Kompaktierung der betroffenen Tage.
+EXTENSIONS = (".csv", ".json", ".jsonl", ".ndjson")
+
+# Übliche Spaltennamen in Exporten -> Schema der Historie
+ALIASES = {
+    "timestamp": "timestamp", "time": "timestamp", "datetime": "timestamp", "date": "timestamp",
+    "city": "city", "location": "city", "stadt": "city",
+    "aqi": "aqi", "overall_aqi": "aqi",
+    "pm25": "pm25", "pm2.5": "pm25", "pm2_5": "pm25",
+    "pm10": "pm10",
+    "co": "co",
+    "no2": "no2",
+    "so2": "so2",
+    "o3": "o3",
+}
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def find_files(root):
+    for directory, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().removesuffix(".gz").endswith(EXTENSIONS):
+                yield os.path.join(directory, name)
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _open(path):
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+# API-Ninjas-Antworten ({"PM2.5": {"concentration": ...}, ...}) auf flache Werte bringen
+def _flatten(record):
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            value = value.get("concentration")
+        flat[key] = value
+    return flat
+
+
+def _records(path):
+    with _open(path) as f:
+        if path.lower().removesuffix(".gz").endswith(".csv"):
+            return pd.read_csv(f)
+        if path.lower().removesuffix(".gz").endswith(".json"):
+            data = json.load(f)
+            if isinstance(data, dict):
+                data = data.get("records") or data.get("data") or [data]
+        else:
+            data = [json.loads(line) for line in f if line.strip()]
+    return pd.DataFrame([_flatten(record) for record in data])
+
+
+# Spaltennamen einer Archivdatei angleichen. Fehlen Stadt oder Datum in den Daten, kommen sie aus
+# dem Pfad (archiv/<stadt>/<YYYY-MM-DD>.json bzw. <stadt>_<YYYY-MM-DD>.csv).
+def _align(df, path):
+    df = df.rename(columns=lambda column: ALIASES.get(str(column).strip().lower(), column))
+    df = df.loc[:, ~df.columns.duplicated()]
+    name = os.path.basename(path).split(".")[0]
+    if "city" not in df.columns:
+        df["city"] = DATE_PATTERN.sub("", name).strip("_- ") or os.path.basename(os.path.dirname(path))
+    if "timestamp" not in df.columns:
+        match = DATE_PATTERN.search(path)
+        df["timestamp"] = match.group(0) if match else None
+    return df.reindex(columns=COLUMNS)
+
+
+# Typen für einen ganzen Block auf einmal umwandeln; pro Datei wäre pandas' Overhead größer als die Arbeit
+def normalize(df):
+    df = df.copy()
+    # Zeitzonenbehaftete Angaben werden nach UTC umgerechnet, die Historie speichert naive Zeitstempel
+    timestamps = pd.to_datetime(df["timestamp"].astype("string"), errors="coerce", utc=True, format="ISO8601")
+    df["timestamp"] = timestamps.dt.tz_localize(None).dt.floor("s")
+    df["city"] = df["city"].astype("string").str.strip()
+    for column in COLUMNS[2:]:
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+    df = df.dropna(subset=["timestamp", "city"])
+    return df[df["city"] != ""]
+
+
+# Läuft im Worker-Prozess: Block von Dateien lesen, innerhalb des Blocks entdoppeln, als Segmente schreiben
+def _import_chunk(root, paths):
+    frames = []
+    errors = []
+    for path in paths:
+        try:
+            frames.append(_align(_records(path), path))
+        except Exception as e:
+            errors.append(f"{path}: {e}")
+    if not frames:
+        return 0, 0, [], errors
+    df = normalize(pd.concat(frames, ignore_index=True))
+    read_rows = len(df)
+    df = df.drop_duplicates(["timestamp", "city"])
+    if not df.empty:
+        HistoryStore(root).append(df)
+    days = sorted(df["timestamp"].dt.strftime("%Y-%m-%d").unique())
+    return read_rows, len(df), days, errors
+
+
+def backfill(archive, store, workers=None, files_per_task=200):
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    stats = {"files": 0, "read": 0, "written": 0, "errors": 0}
+    touched = set()
+    # Höchstens zwei Blöcke pro Worker in Arbeit, damit der Speicherbedarf auch bei großen Archiven begrenzt bleibt
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        for chunk in _chunks(find_files(archive), files_per_task):
+            if len(pending) >= workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect({future: pending.pop(future) for future in done}, stats, touched)
+            pending[pool.submit(_import_chunk, store.root, chunk)] = len(chunk)
+        _collect(pending, stats, touched)
+
+    days = sorted(touched)
+    before = store.count_rows(days)
+    for day in days:
+        store.compact(day, blocking=True)
+    stats["duplicates"] = before - store.count_rows(days)
+    stats["days"] = len(days)
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def _collect(futures, stats, touched):
+    for future, files in futures.items():
+        read_rows, written, days, errors = future.result()
+        stats["files"] += files
+        stats["read"] += read_rows
+        stats["written"] += written
+        stats["errors"] += len(errors)
+        touched.update(days)
+        for error in errors[:3]:
+            print(f"⚠️ {error}")
+    if stats["files"]:
+        print(f"📥 {stats['files']} Dateien, {stats['read']} Zeilen gelesen")
+
+
+if __name__ == "__main__":
+    # python -m luftqualitaet.backfill archiv/ [--workers 8]
+    parser = argparse.ArgumentParser(description="Historische Messdaten in die Parquet-Historie importieren")
+    parser.add_argument("archive", help="Ordner mit CSV-/JSON-Exporten (rekursiv)")
+    parser.add_argument("--history", default=HISTORY_PATH, help="Ziel-Historie")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: CPU-Kerne)")
+    parser.add_argument("--files-per-task", type=int, default=200, help="Dateien pro Block")
+    parser.add_argument("--no-rebuild", action="store_true", help="AQI-Zeitreihe, Statistik und Shards nicht neu aufbauen")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.history)
+    stats = backfill(args.archive, store, args.workers, args.files_per_task)
+    rate = stats["read"] / stats["seconds"] if stats["seconds"] else 0
+    print(f"✅ Backfill: {stats['read']} Zeilen aus {stats['files']} Dateien in {stats['seconds']:.1f} s "
+          f"({rate:,.0f} Zeilen/s), {stats['written'] - stats['duplicates']} neu, "
+          f"{stats['read'] - stats['written'] + stats['duplicates']} Duplikate, {stats['days']} Tage, "
+          f"{stats['errors']} fehlerhafte Dateien")
+    # Zeitreihe, Statistik und Shards haben einen Wasserstand hinter den neuen Daten und müssen einmal neu aufgebaut werden
+    if stats["written"] and not args.no_rebuild:
+        from luftqualitaet.series import write_series
+        from luftqualitaet.stats import StatsState
+        from luftqualitaet.timeline import TimelineState
+
+        TimelineState(TIMELINE_STATE_PATH).rebuild(store)
+        StatsState(STATS_STATE_PATH).rebuild(store)
+        write_series(store, rebuild=True)
@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from luftqualitaet.output import temp_name
+
+
+# Persistenter Antwort-Cache pro Stadt für API Ninjas mit TTL und Größenbegrenzung (LRU).
+# Neben den Messwerten wird das Ergebnis des letzten echten Abrufs gespeichert, daraus leitet
+# die Statusseite die API-Gesundheit ab. Treffer und Abrufe pro Lauf zählt der Sammelschritt
+# (count), die Summen bleiben in der Cache-Datei erhalten.
+class ResponseCache:
+    def __init__(self, path="data/ninjas_cache.json", ttl=3600, max_entries=1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = None
+        self.totals = {"hits": 0, "misses": 0}
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        if self.entries is not None:
+            return
+        self.entries = OrderedDict()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            self.entries.update(stored.get("entries", {}))
+            self.totals.update(stored.get("totals", {}))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Antwort-Cache {self.path} nicht lesbar, starte leer: {e}")
+
+    def save(self):
+        with self.lock:
+            self._load()
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = temp_name(self.path)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": self.entries, "totals": self.totals}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    # Liefert die gecachten Werte, solange sie jünger als die TTL sind (AI-Zusammenfassung);
+    # für API Ninjas entscheidet stattdessen die Planung der fälligen Städte über die TTL
+    def get(self, key):
+        with self.lock:
+            self._load()
+            entry = self.entries.get(key)
+            if entry and entry.get("data") is not None and time.time() - entry["fetched_at"] < self.ttl:
+                self.entries.move_to_end(key)
+                return dict(entry["data"])
+            return None
+
+    # Treffer: Städte, die noch nicht fällig waren und aus dem Cache bedient wurden; Abrufe: eingeplante Städte
+    def count(self, hits, misses):
+        with self.lock:
+            self._load()
+            self.hits, self.misses = hits, misses
+            self.totals["hits"] += hits
+            self.totals["misses"] += misses
+
+    def put(self, key, data, latency_ms=None):
+        with self.lock:
+            self._load()
+            now = time.time()
+            self.entries[key] = {
+                "data": data,
+                "fetched_at": now,
+                "attempt": {"at": now, "ok": True, "status_code": 200, "latency_ms": latency_ms, "error": None},
+            }
+            self.entries.move_to_end(key)
+            self._evict()
+
+    # Fehlgeschlagener Abruf: alte Messwerte bleiben erhalten, nur das Abrufergebnis wird vermerkt
+    def record_error(self, key, error, status_code=None, latency_ms=None):
+        with self.lock:
+            self._load()
+            entry = self.entries.setdefault(key, {"data": None, "fetched_at": 0})
+            entry["attempt"] = {"at": time.time(), "ok": False, "status_code": status_code, "latency_ms": latency_ms, "error": str(error)}
+            self.entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    # Letzte bekannte Werte unabhängig von der TTL
+    def peek(self, key):
+        with self.lock:
+            self._load()
+            entry = self.entries.get(key)
+            if entry and entry.get("data") is not None:
+                return dict(entry["data"])
+            return None
+
+    def fetched_at(self, key):
+        with self.lock:
+            self._load()
+            entry = self.entries.get(key)
+            return entry["fetched_at"] if entry and entry.get("data") is not None else None
+
+    # Zeitpunkt (Unix-Zeit) des jüngsten erfolgreichen Abrufs der angegebenen Schlüssel
+    def last_fetched(self, keys):
+        with self.lock:
+            self._load()
+            times = [self.entries[key]["fetched_at"] for key in keys if key in self.entries and self.entries[key].get("data") is not None]
+        return max(times) if times else None
+
+    # Zusammenfassung der letzten echten Abrufe für die Statusseite
+    def health(self, keys=None):
+        with self.lock:
+            self._load()
+            attempts = [
+                entry["attempt"] for key, entry in self.entries.items()
+                if entry.get("attempt") and (keys is None or key in keys)
+            ]
+        ok = [a for a in attempts if a["ok"]]
+        failed = [a for a in attempts if not a["ok"]]
+        latencies = [a["latency_ms"] for a in ok if a.get("latency_ms") is not None]
+        return {
+            "ok": len(ok),
+            "failed": len(failed),
+            "last_error": max(failed, key=lambda a: a["at"])["error"] if failed else None,
+            "last_status_code": max(failed, key=lambda a: a["at"])["status_code"] if failed else None,
+            "latency_ms": sum(latencies) / len(latencies) if latencies else None,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,234 @@
+import os
+from functools import partial
+
+from luftqualitaet import client
+from luftqualitaet.config import (
+    CHART_WORKERS,
+    DATAWRAPPER_API_TOKEN,
+    HEADERS_DW,
+    TIMELINE_AGG,
+    TIMELINE_DOWNSAMPLE,
+    TIMELINE_MAX_POINTS,
+)
+from luftqualitaet.csvio import dataframe_to_csv, records_to_csv
+from luftqualitaet.hashes import digest
+from luftqualitaet.pipeline import run_chart_pipeline, stage
+from luftqualitaet.stores import get_chart_registry, get_content_hashes, get_history, get_metrics, get_timeline_state
+
+
+charts_info = [
+    ("Luftqualitätsindex (AQI) in deutschen Städten", "aqi"),
+    ("Feinstaub PM2.5 Konzentration", "pm25"),
+    ("Feinstaub PM10 Konzentration", "pm10"),
+    ("Stickstoffdioxid (NO2)", "no2"),
+    ("Ozon (O3)", "o3"),
+    ("Schwefeldioxid (SO2)", "so2"),
+    ("Kohlenmonoxid (CO)", "co"),
+    ("Luftqualitätskomponenten Vergleich", "multi")
+]
+
+# Reihenfolge der Abschnitte auf der Seite: Balkendiagramme, Überschreitungen, zuletzt der Verlauf.
+# Die Karte ist die Leaflet-Karte (Marker + AQI-Raster) auf der Seite selbst.
+chart_keys = [col for _, col in charts_info] + ["exceedances", "timeline"]
+
+
+def create_chart(title, chart_type, create_metadata=None):
+    payload = {"title": title, "type": chart_type}
+    if create_metadata:
+        payload["metadata"] = create_metadata
+    resp = client.post("datawrapper", "/v3/charts", headers=HEADERS_DW, json=payload)
+    resp.raise_for_status()
+    return resp.json()["id"]
+
+# Gibt False zurück, wenn der Chart in Datawrapper nicht mehr existiert
+def upload_chart_data(chart_id, csv_payload):
+    resp = client.put(
+        "datawrapper",
+        f"/v3/charts/{chart_id}/data",
+        headers={"Authorization": f"Bearer {DATAWRAPPER_API_TOKEN}", "Content-Type": "text/csv"},
+        data=csv_payload.encode("utf-8")
+    )
+    if resp.status_code == 404:
+        return False
+    resp.raise_for_status()
+    return True
+
+def publish_chart(key, title, chart_type, csv_payload, meta, create_metadata=None, timings=None):
+    chart_registry = get_chart_registry()
+    hashes = get_content_hashes()
+    meta_hash = digest(meta)
+    content_hash = digest(chart_type, csv_payload, meta, create_metadata)
+    entry = chart_registry.get(key)
+    chart_id = entry["id"] if entry and entry.get("type") == chart_type else None
+
+    # Gleiche Daten und Metadaten wie beim letzten Lauf: kein Upload, kein erneutes Veröffentlichen
+    if chart_id and entry.get("public_url") and hashes.unchanged(f"chart:{key}", content_hash):
+        hashes.skip(f"chart:{key}", saved_requests=2)
+        return entry["public_url"]
+
+    # Bekannten Chart nur mit neuen Daten befüllen
+    if chart_id:
+        with stage(timings, "daten"):
+            uploaded = upload_chart_data(chart_id, csv_payload)
+        if not uploaded:
+            print(f"♻️ Chart {chart_id} ({key}) existiert nicht mehr, lege ihn neu an")
+            chart_registry.remove(key)
+            chart_id = None
+
+    if chart_id is None:
+        with stage(timings, "anlegen"):
+            chart_id = create_chart(title, chart_type, create_metadata)
+        with stage(timings, "daten"):
+            if not upload_chart_data(chart_id, csv_payload):
+                raise RuntimeError(f"Chart {chart_id} nach dem Anlegen nicht gefunden")
+        chart_registry.set(key, chart_id, type=chart_type, title=title)
+        entry = chart_registry.get(key)
+
+    # Metadaten nur senden, wenn sie sich seit dem letzten Lauf geändert haben
+    if entry.get("meta_hash") != meta_hash:
+        with stage(timings, "metadaten"):
+            # Setzt immer dieselben Werte, eine Wiederholung ist unschädlich
+            resp = client.patch("datawrapper", f"/v3/charts/{chart_id}", headers=HEADERS_DW, json=meta, idempotent=True)
+            resp.raise_for_status()
+        chart_registry.update(key, meta_hash=meta_hash)
+
+    # Veröffentlichen (erneutes Veröffentlichen desselben Charts ist unschädlich)
+    with stage(timings, "veröffentlichen"):
+        resp = client.post(
+            "datawrapper",
+            f"/v3/charts/{chart_id}/publish",
+            headers=HEADERS_DW,
+            timeout=client.TIMEOUTS["datawrapper_publish"],
+            idempotent=True
+        )
+        resp.raise_for_status()
+    body = resp.json()
+    public_url = body.get("url") or body.get("data", {}).get("publicUrl") or f"https://datawrapper.dwcdn.net/{chart_id}/"
+    chart_registry.update(key, public_url=public_url)
+    hashes.record(f"chart:{key}", content_hash)
+    return public_url
+
+# Die URLs wurden beim Chart-Upload erstellt, aber wir fangen sie jetzt ab
+def create_and_publish_chart_with_return(data_list, key, title, columns, chart_type="d3-bars", timings=None):
+    csv_part = records_to_csv(data_list, ["city"] + columns)
+
+    # Metadaten
+    meta = {
+        "metadata": {
+            "describe": {
+                "source-name": "API Ninjas",
+                "source-url": "https://api-ninjas.com/api/airquality",
+                "byline": "Automatisch erzeugt mit Python",
+                "intro": f"{title} für deutsche Großstädte (aktuell)"
+            },
+            "visualize": {
+                "x-axis": {"title": "Stadt"},
+                "y-axis": {"title": "Wert"},
+                "sharing": {"enabled": True}
+            }
+        }
+    }
+    public_url = publish_chart(key, title, chart_type, csv_part, meta, timings=timings)
+
+    print(f"✅ {title} veröffentlicht: {public_url}")
+    return public_url
+
+def create_aqi_timeline_chart(timings=None):
+    title = "AQI-Verlauf in deutschen Städten (letzte Tage)"
+
+    with stage(timings, "aufbereiten"):
+        # Zeitreihe: eine Zeile pro Zeit, Spalten = Städte (inkrementell aus dem gespeicherten Zustand)
+        timeline_state = get_timeline_state()
+        if os.getenv("TIMELINE_REBUILD") == "1":
+            pivot = timeline_state.rebuild(get_history())
+        else:
+            pivot = timeline_state.update(get_history())
+
+    with stage(timings, "downsampling"):
+        # numpy/pandas werden erst hier geladen
+        from luftqualitaet.downsample import downsample
+
+        raw_points = len(pivot)
+        pivot = downsample(pivot, TIMELINE_DOWNSAMPLE, TIMELINE_MAX_POINTS, TIMELINE_AGG)
+        if len(pivot) < raw_points:
+            print(f"📉 Verlauf von {raw_points} auf {len(pivot)} Zeitpunkte reduziert ({TIMELINE_DOWNSAMPLE})")
+
+    with stage(timings, "csv"):
+        # CSV-Daten für Datawrapper vorbereiten
+        csv_data = dataframe_to_csv(pivot, index=True)
+
+    # Metadaten
+    meta = {
+        "metadata": {
+            "describe": {
+                "source-name": "API Ninjas",
+                "source-url": "https://api-ninjas.com/api/airquality",
+                "byline": "Automatisch erzeugt mit Python",
+                "intro": f"AQI-Zeitverlauf deutscher Städte"
+            },
+            "visualize": {
+                "x-axis": {"title": "Zeitpunkt"},
+                "y-axis": {"title": "AQI"},
+                # Leere Zellen (nicht abgerufene oder beim Downsampling ausgelassene Werte) überbrücken
+                "connect-between-gaps": True,
+                "sharing": {"enabled": True}
+            }
+        }
+    }
+    public_url = publish_chart("timeline", title, "d3-lines", csv_data, meta, timings=timings)
+    print(f"📈 Verlauf-Chart veröffentlicht: {public_url}")
+    return public_url
+
+# Tage über den WHO-Richtwerten je Stadt und Schadstoff über die gesamte Historie (aus der Statistik)
+def create_exceedance_chart(stats, timings=None):
+    from luftqualitaet.stats import LABELS
+
+    title = "Tage über WHO-Richtwerten"
+    limits = [limit for limit in stats["limits"] if limit["source"] == "WHO"]
+    columns = [LABELS[limit["pollutant"]] for limit in limits]
+    records = []
+    for city, entry in stats["cities"].items():
+        record = {"city": city}
+        for limit, column in zip(limits, columns):
+            record[column] = entry["exceedances"]["WHO"][limit["key"]]
+        records.append(record)
+    csv_data = records_to_csv(records, ["city"] + columns)
+
+    meta = {
+        "metadata": {
+            "describe": {
+                "source-name": "API Ninjas",
+                "source-url": "https://api-ninjas.com/api/airquality",
+                "byline": "Automatisch erzeugt mit Python",
+                "intro": f"Tage seit {stats['first_day']} mit Tagesmittel (Ozon: höchstes 8-Stunden-Mittel) über den WHO-Richtwerten 2021"
+            },
+            "visualize": {
+                "x-axis": {"title": "Stadt"},
+                "y-axis": {"title": "Tage"},
+                "sharing": {"enabled": True}
+            }
+        }
+    }
+    public_url = publish_chart("exceedances", title, "d3-bars-stacked", csv_data, meta, timings=timings)
+    print(f"✅ {title} veröffentlicht: {public_url}")
+    return public_url
+
+def publish_charts(data_list, stats=None):
+    chart_jobs = []
+    for title, col in charts_info:
+        if col == "multi":
+            chart_jobs.append((col, partial(create_and_publish_chart_with_return, data_list, col, title, ["pm25", "pm10", "co", "no2", "so2", "o3"], chart_type="d3-bars-split")))
+        else:
+            chart_jobs.append((col, partial(create_and_publish_chart_with_return, data_list, col, title, [col])))
+    if stats:
+        chart_jobs.append(("exceedances", partial(create_exceedance_chart, stats)))
+    chart_jobs.append(("timeline", create_aqi_timeline_chart))
+
+    # Charts parallel veröffentlichen
+    chart_urls, chart_timings, chart_errors = run_chart_pipeline(chart_jobs, max_workers=CHART_WORKERS)
+    metrics = get_metrics()
+    for key, job_timings in chart_timings.items():
+        for name, seconds in job_timings.items():
+            metrics.observe("chart_stage_seconds", seconds, chart=key, stage=name)
+    get_content_hashes().save()
+    return chart_urls
@@ -0,0 +1,67 @@
+import csv
+import time
+
+
+# Städte-Registry aus einer CSV-Datei (name, lat, lon, region, priority).
+# Priorität 1 wird in jedem Zyklus abgerufen, Priorität 2 jeden zweiten, 3 jeden vierten usw.
+class CityRegistry:
+    def __init__(self, cities):
+        self.cities = cities
+        self.by_name = {city["name"]: city for city in cities}
+        self.by_region = {}
+        for city in cities:
+            self.by_region.setdefault(city["region"], []).append(city)
+
+    @classmethod
+    def from_csv(cls, path, max_priority=None):
+        cities = []
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                priority = int(row.get("priority") or 1)
+                if max_priority and priority > max_priority:
+                    continue
+                cities.append({
+                    "name": row["name"].strip(),
+                    "lat": float(row["lat"]) if row.get("lat") else None,
+                    "lon": float(row["lon"]) if row.get("lon") else None,
+                    "region": (row.get("region") or "").strip(),
+                    "priority": priority,
+                })
+        return cls(cities)
+
+    # Nur Namen, ohne Koordinaten (z.B. CITIES=... für Benchmarks)
+    @classmethod
+    def from_names(cls, names):
+        return cls([{"name": name, "lat": None, "lon": None, "region": "", "priority": 1} for name in names])
+
+    def names(self):
+        return [city["name"] for city in self.cities]
+
+    def coords(self):
+        return {city["name"]: [city["lat"], city["lon"]] for city in self.cities if city["lat"] is not None}
+
+    def region(self, region):
+        return [city["name"] for city in self.by_region.get(region, [])]
+
+    # Abrufabstand einer Stadt: interval * 2**(priority-1), mindestens min_age
+    def target_age(self, name, interval, min_age=0):
+        city = self.by_name.get(name)
+        return max(interval * 2 ** ((city["priority"] if city else 1) - 1), min_age)
+
+    # Wählt die Städte für diesen Zyklus: fällig ist eine Stadt, wenn ihr letzter Abruf älter ist als
+    # ihr Abrufabstand (target_age). Die überfälligsten zuerst, höchstens `quota` Städte (0 = alle fälligen).
+    def select_shard(self, fetched_at, interval, quota=0, min_age=0, now=None):
+        now = now or time.time()
+        due = []
+        for city in self.cities:
+            last = fetched_at(city["name"])
+            target = self.target_age(city["name"], interval, min_age)
+            # Noch nie abgerufene Städte haben unendliche Überfälligkeit; 10 % Spielraum gleicht
+            # kleine Schwankungen im Takt des Schedulers aus
+            staleness = float("inf") if not last else (now - last + 0.1 * interval) / target
+            if staleness >= 1:
+                due.append((staleness, -city["priority"], city["name"]))
+        due.sort(reverse=True)
+        if quota:
+            due = due[:quota]
+        return [name for _, _, name in due]
@@ -0,0 +1,140 @@
+import os
+import random
+import threading
+import time
+
+from luftqualitaet.stores import get_metrics
+
+
+# Basis-URLs der genutzten APIs – je API gibt es genau eine Session mit Connection-Pool
+# (per Umgebungsvariable überschreibbar, z.B. für die Stub-Server in bench/)
+BASE_URLS = {
+    "ninjas": os.getenv("NINJAS_BASE_URL", "https://api.api-ninjas.com"),
+    "datawrapper": os.getenv("DATAWRAPPER_BASE_URL", "https://api.datawrapper.de"),
+    "openrouter": os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai"),
+}
+
+# Timeouts als (connect, read) in Sekunden
+TIMEOUTS = {
+    "ninjas": (3.05, 10),
+    "datawrapper": (3.05, 20),
+    "datawrapper_publish": (3.05, 60),
+    "openrouter": (3.05, 90),
+    "status": (3.05, 5),
+}
+
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "10"))
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Nur diese Methoden dürfen nach Timeouts und 5xx wiederholt werden; ein POST kann beim Server bereits
+# angekommen sein (z.B. ein angelegter Chart) und würde sonst doppelt ausgeführt
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(api):
+    with _sessions_lock:
+        session = _sessions.get(api)
+        if session is None:
+            # requests wird erst bei der ersten Anfrage geladen
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            # Keep-Alive: Verbindungen werden im Pool gehalten und wiederverwendet
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[api] = session
+        return session
+
+
+def close_sessions():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _backoff(attempt):
+    # Exponentieller Backoff mit "Full Jitter"
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return min(BACKOFF_MAX, max(0.0, float(value)))
+    except ValueError:
+        return None
+
+
+# Führt eine Anfrage über die gepoolte Session der API aus und wiederholt bei 429/5xx und Verbindungsfehlern.
+# Nicht idempotente Anfragen (POST/PATCH, außer mit idempotent=True) werden nur wiederholt, wenn sie den
+# Server sicher nicht erreicht haben: Timeout beim Verbindungsaufbau oder 429.
+def request(api, method, path, timeout=None, retries=None, idempotent=None, **kwargs):
+    import requests
+
+    url = path if path.startswith("http") else BASE_URLS[api] + path
+    timeout = timeout or TIMEOUTS[api]
+    retries = MAX_RETRIES if retries is None else retries
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    session = get_session(api)
+
+    metrics = get_metrics()
+    for attempt in range(retries + 1):
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            metrics.inc("http_requests_total", api=api, method=method, status="error")
+            metrics.observe("http_request_seconds", time.perf_counter() - start, api=api)
+            if attempt == retries or not (idempotent or isinstance(e, requests.ConnectTimeout)):
+                raise
+            delay = _backoff(attempt)
+            reason = type(e).__name__
+        else:
+            _record_response(metrics, api, method, response, time.perf_counter() - start)
+            if response.status_code not in RETRY_STATUS or attempt == retries:
+                return response
+            if not idempotent and response.status_code != 429:
+                return response
+            delay = _retry_after(response)
+            if delay is None:
+                delay = _backoff(attempt)
+            reason = f"Status {response.status_code}"
+        metrics.inc("http_retries_total", api=api, reason=reason)
+        print(f"↻ {method} {url}: {reason}, neuer Versuch in {delay:.1f} s")
+        time.sleep(delay)
+
+
+def _record_response(metrics, api, method, response, seconds):
+    metrics.inc("http_requests_total", api=api, method=method, status=str(response.status_code))
+    metrics.observe("http_request_seconds", seconds, api=api)
+    body = response.request.body if response.request is not None else None
+    if body:
+        metrics.inc("http_bytes_sent_total", len(body.encode("utf-8") if isinstance(body, str) else body), api=api)
+    metrics.inc("http_bytes_received_total", len(response.content or b""), api=api)
+
+
+def get(api, path, **kwargs):
+    return request(api, "GET", path, **kwargs)
+
+
+def post(api, path, **kwargs):
+    return request(api, "POST", path, **kwargs)
+
+
+def put(api, path, **kwargs):
+    return request(api, "PUT", path, **kwargs)
+
+
+def patch(api, path, **kwargs):
+    return request(api, "PATCH", path, **kwargs)
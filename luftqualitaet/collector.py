@@ -0,0 +1,154 @@
+import time
+from datetime import datetime
+
+from luftqualitaet import client
+from luftqualitaet.config import (
+    CITY_SHARD_SIZE,
+    COLLECT_INTERVAL,
+    HEADERS_NINJA,
+    NINJA_CACHE_TTL,
+    NINJA_DAILY_QUOTA,
+    NINJA_MAX_WORKERS,
+    NINJA_RETRIES,
+)
+from luftqualitaet.fetch import fetch_all
+from luftqualitaet.stores import get_city_registry, get_history, get_metrics, get_ninja_guard, get_response_cache
+
+
+# Luftqualitätsdaten abrufen; der Antwort-Cache hält Werte und Abrufergebnis für Momentaufnahme und Statusseite
+def get_air_quality(city):
+    cache = get_response_cache()
+    guard = get_ninja_guard()
+    start = time.perf_counter()
+    status_code = None
+    try:
+        # Der Hook zählt jede Antwort (auch Wiederholungen) gegen die Quote und bremst bei 429
+        response = client.get("ninjas", "/v1/airquality", params={"city": city}, headers=HEADERS_NINJA,
+                              retries=NINJA_RETRIES, hooks={"response": guard.on_response})
+        status_code = response.status_code
+        response.raise_for_status()
+        result = parse_air_quality(city, response.json())
+    except Exception as e:
+        cache.record_error(city, e, status_code, (time.perf_counter() - start) * 1000)
+        # Nur Überlastung, Serverfehler und Verbindungsprobleme zählen für den Circuit Breaker;
+        # eine unbekannte Stadt (4xx) sagt nichts über die API aus
+        if status_code is None or status_code == 429 or status_code >= 500:
+            guard.failure(e)
+        else:
+            guard.success()
+        raise
+    guard.success()
+    cache.put(city, result, (time.perf_counter() - start) * 1000)
+    return result
+
+
+def parse_air_quality(city, data):
+    return {
+        "city": city,
+        "aqi": data["overall_aqi"],
+        "pm25": data["PM2.5"]["concentration"],
+        "pm10": data["PM10"]["concentration"],
+        "co": data["CO"]["concentration"],
+        "no2": data["NO2"]["concentration"],
+        "so2": data["SO2"]["concentration"],
+        "o3": data["O3"]["concentration"],
+    }
+
+
+# Abrufe pro Zyklus: feste Shard-Größe und/oder Tagesquote auf die Zyklen eines Tages verteilt
+def shard_quota():
+    quota = CITY_SHARD_SIZE
+    if NINJA_DAILY_QUOTA:
+        per_cycle = max(1, NINJA_DAILY_QUOTA * COLLECT_INTERVAL // 86400)
+        quota = min(quota, per_cycle) if quota else per_cycle
+    return quota
+
+
+# Daten sammeln (parallel, durch Token-Bucket auf die API-Quote begrenzt) und an die Historie anhängen.
+# Bei großen Städtelisten wird pro Zyklus nur ein Shard der fälligen Städte abgerufen.
+def collect():
+    # Zeitstempel für die Messung
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    date_str = datetime.now().strftime("%Y-%m-%d")
+
+    cache = get_response_cache()
+    registry = get_city_registry()
+    guard = get_ninja_guard()
+    metrics = get_metrics()
+    # Fällige Städte, die überfälligsten zuerst; begrenzt durch Shard-Größe und verbleibende Tagesquote.
+    # NINJA_CACHE_TTL ist der Mindestabstand zwischen zwei Abrufen derselben Stadt.
+    due = registry.select_shard(cache.fetched_at, COLLECT_INTERVAL, min_age=NINJA_CACHE_TTL)
+    quota = shard_quota()
+    budget = guard.budget()
+    if budget is not None:
+        quota = min(quota, budget) if quota else budget
+    circuit = guard.circuit_state()
+    if circuit == "offen":
+        print(f"🔌 Circuit Breaker offen, {len(due)} fällige Städte werden in diesem Zyklus nicht abgerufen")
+        shard = []
+    elif budget == 0:
+        print(f"🚫 Tagesquote erschöpft, {len(due)} fällige Städte werden in diesem Zyklus nicht abgerufen")
+        shard = []
+    else:
+        shard = due[:quota] if quota else due
+    guard.decision("fetch", len(shard))
+    guard.decision("deferred", len(due) - len(shard))
+    metrics.set("ninjas_cities_due", len(due))
+    fetched, fetch_errors, fetch_seconds = fetch_all(
+        shard,
+        get_air_quality,
+        max_workers=NINJA_MAX_WORKERS,
+        bucket=guard.bucket,
+        check=guard.check,
+    )
+    guard.save()
+
+    # Momentaufnahme für Charts und Seite: nicht abgerufene Städte mit ihren letzten bekannten Werten.
+    # Werte, die älter als der doppelte Abrufabstand der Stadt sind, gelten nicht mehr als aktuell.
+    # Noch nicht fällige Städte zählen als Cache-Treffer, eingeplante Städte als Abrufe.
+    fetched_names = {entry["city"] for entry in fetched}
+    due_names = set(due)
+    now = time.time()
+    snapshot = []
+    stale = 0
+    hits = 0
+    for city in registry.names():
+        if city in fetched_names:
+            continue
+        entry, fetched_at = cache.peek(city), cache.fetched_at(city)
+        if entry is None:
+            continue
+        if now - fetched_at > 2 * registry.target_age(city, COLLECT_INTERVAL, NINJA_CACHE_TTL):
+            stale += 1
+            continue
+        snapshot.append(entry)
+        if city not in due_names:
+            hits += 1
+    data_list = fetched + snapshot
+    print(f"🏙️ {len(due)}/{len(registry.cities)} Städte fällig, {len(shard)} eingeplant, "
+          f"{len(data_list)} mit Werten aus {len(registry.by_region)} Regionen"
+          + (f", {stale} mit veralteten Werten ausgelassen" if stale else ""))
+
+    cache.count(hits, len(shard))
+    metrics.inc("ninjas_cache_hits_total", hits)
+    metrics.inc("ninjas_cache_misses_total", len(shard))
+    cache.save()
+    print(f"🗃️ Antwort-Cache: {cache.hits} Treffer, {cache.misses} Abrufe "
+          f"(gesamt {cache.totals['hits']} Treffer / {cache.totals['misses']} Abrufe)")
+
+    # Nach AQI sortieren
+    data_list.sort(key=lambda x: x["aqi"])
+
+    # Nur frisch abgerufene Messungen an die Historie anhängen und abgeschlossene Tage zusammenfassen
+    fresh = [{"timestamp": timestamp, **entry} for entry in fetched]
+    history = get_history()
+    history.append(fresh)
+    history.compact_before(date_str)
+
+    # Wurde nichts abgerufen, bleibt der Zeitpunkt der letzten echten Messung gültig,
+    # damit unveränderte Daten auch unveränderte Seiten ergeben
+    if not fresh and data_list:
+        last_fetched = cache.last_fetched([entry["city"] for entry in data_list])
+        if last_fetched:
+            timestamp = datetime.fromtimestamp(last_fetched).strftime("%Y-%m-%d %H:%M:%S")
+    return timestamp, data_list
@@ -0,0 +1,76 @@
+import os
+
+
+# Konfiguration aus Umgebungsvariablen (nur Lesen, keine Seiteneffekte beim Import)
+
+# Ordner für Datenhistorie und zustandsbehaftete Speicher
+HISTORY_PATH = os.getenv("HISTORY_PATH", "data/history")
+TIMELINE_STATE_PATH = os.getenv("TIMELINE_STATE_PATH", "data/timeline/aqi.parquet")
+STATS_STATE_PATH = os.getenv("STATS_STATE_PATH", "data/stats/daily.parquet")
+# Ausgabeordner für die Website (index.html, status.html, assets/, metrics.*), im Container das nginx-Root
+OUTPUT_DIR = os.getenv("OUTPUT_DIR", ".")
+# Alte Asset-Versionen werden nach dieser Zeit (Sekunden) gelöscht
+ASSET_MAX_AGE = int(os.getenv("ASSET_MAX_AGE", str(7 * 24 * 3600)))
+
+# API Keys from environment variables
+NINJA_API_KEY = os.getenv("NINJA_API_KEY")
+HEADERS_NINJA = {"X-Api-Key": NINJA_API_KEY}
+# Parallele Abrufe und Quote für API Ninjas (Anfragen pro Sekunde)
+NINJA_MAX_WORKERS = int(os.getenv("NINJA_MAX_WORKERS", "4"))
+NINJA_RATE_PER_SEC = float(os.getenv("NINJA_RATE_PER_SEC", "5"))
+NINJA_BURST = int(os.getenv("NINJA_BURST", "5"))
+# Antwort-Cache pro Stadt (letzte Werte und Abrufergebnis): maximale Anzahl Einträge; die TTL ist der
+# Mindestabstand in Sekunden, bevor eine Stadt erneut abgerufen wird. Standard ist der Sammeltakt
+# (COLLECT_INTERVAL), Städte mit Priorität 1 werden also weiterhin in jedem Zyklus abgerufen.
+NINJA_CACHE_PATH = os.getenv("NINJA_CACHE_PATH", "data/ninjas_cache.json")
+NINJA_CACHE_TTL = int(os.getenv("NINJA_CACHE_TTL", os.getenv("COLLECT_INTERVAL", "1080")))
+NINJA_CACHE_MAX_ENTRIES = int(os.getenv("NINJA_CACHE_MAX_ENTRIES", "1000"))
+# Wiederholungen pro Abruf, Circuit Breaker (Fehler in Folge, Pause in Sekunden) und gespeicherter Zustand
+NINJA_RETRIES = int(os.getenv("NINJA_RETRIES", "1"))
+NINJA_BREAKER_THRESHOLD = int(os.getenv("NINJA_BREAKER_THRESHOLD", "5"))
+NINJA_BREAKER_COOLDOWN = int(os.getenv("NINJA_BREAKER_COOLDOWN", "900"))
+NINJA_GUARD_PATH = os.getenv("NINJA_GUARD_PATH", "data/ninjas_guard.json")
+
+OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+# Harte Frist (Sekunden) für die AI-Zusammenfassung und Cache nach Prompt-Eingaben
+AI_SUMMARY_DEADLINE = float(os.getenv("AI_SUMMARY_DEADLINE", "45"))
+AI_SUMMARY_CACHE_PATH = os.getenv("AI_SUMMARY_CACHE_PATH", "data/ai_summary_cache.json")
+AI_SUMMARY_CACHE_TTL = int(os.getenv("AI_SUMMARY_CACHE_TTL", str(30 * 24 * 3600)))
+
+DATAWRAPPER_API_TOKEN = os.getenv("DATAWRAPPER_API_TOKEN")
+HEADERS_DW = {
+    "Authorization": f"Bearer {DATAWRAPPER_API_TOKEN}",
+    "Content-Type": "application/json"
+}
+CHART_REGISTRY_PATH = os.getenv("CHART_REGISTRY_PATH", "data/charts.json")
+CONTENT_HASHES_PATH = os.getenv("CONTENT_HASHES_PATH", "data/content_hashes.json")
+# Verlauf der Status-Checks: ein Ringpuffer pro Check, Anzahl gespeicherter Läufe und angezeigter Balken
+STATUS_HISTORY_DIR = os.getenv("STATUS_HISTORY_DIR", "data/status")
+STATUS_HISTORY_SIZE = int(os.getenv("STATUS_HISTORY_SIZE", "1000"))
+STATUS_BARS = int(os.getenv("STATUS_BARS", "47"))
+# Anzahl der Charts, die gleichzeitig veröffentlicht werden
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", "4"))
+# Downsampling des AQI-Verlaufs: none, hourly, daily oder lttb; Obergrenze an Punkten pro Stadt
+TIMELINE_DOWNSAMPLE = os.getenv("TIMELINE_DOWNSAMPLE", "lttb")
+TIMELINE_AGG = os.getenv("TIMELINE_AGG", "mean")
+TIMELINE_MAX_POINTS = int(os.getenv("TIMELINE_MAX_POINTS", "1000"))
+# AQI-Raster (IDW) für die Leaflet-Karte: Breite in Pixeln, Potenz der Gewichtung und Entfernung (km),
+# ab der die Fläche ausgeblendet wird
+GRID_WIDTH = int(os.getenv("GRID_WIDTH", "256"))
+GRID_POWER = float(os.getenv("GRID_POWER", "2"))
+GRID_MAX_DISTANCE_KM = float(os.getenv("GRID_MAX_DISTANCE_KM", "150"))
+# Auflösungen der statischen Zeitreihen-Shards unter series/ (hour, day)
+SERIES_RESOLUTIONS = [r.strip() for r in os.getenv("SERIES_RESOLUTIONS", "hour,day").split(",") if r.strip()]
+# Intervalle des Daemon-Modus in Sekunden
+COLLECT_INTERVAL = int(os.getenv("COLLECT_INTERVAL", "1080"))
+PUBLISH_INTERVAL = int(os.getenv("PUBLISH_INTERVAL", str(COLLECT_INTERVAL)))
+RENDER_INTERVAL = int(os.getenv("RENDER_INTERVAL", str(COLLECT_INTERVAL)))
+
+# Städte-Registry (name, lat, lon, region, priority); standardmäßig nur Priorität 1 (die zehn größten Städte)
+CITIES_PATH = os.getenv("CITIES_PATH", os.path.join(os.path.dirname(__file__), "cities.csv"))
+CITY_MAX_PRIORITY = int(os.getenv("CITY_MAX_PRIORITY", "1"))
+# Kommagetrennte Liste ersetzt die Registry (z.B. für Benchmarks mit mehr Städten)
+CITIES_OVERRIDE = [city.strip() for city in os.getenv("CITIES", "").split(",") if city.strip()]
+# Höchstens so viele Abrufe pro Zyklus (0 = alle fälligen Städte) und Tagesquote der API (0 = unbegrenzt)
+CITY_SHARD_SIZE = int(os.getenv("CITY_SHARD_SIZE", "0"))
+NINJA_DAILY_QUOTA = int(os.getenv("NINJA_DAILY_QUOTA", "0"))
@@ -0,0 +1,22 @@
+import csv
+import io
+from operator import itemgetter
+
+
+# Gemeinsamer CSV-Serializer für alle Datawrapper-Uploads (korrektes Quoting, keine Python-Schleife pro Zeile)
+
+def dataframe_to_csv(df, index=False, date_format=None):
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=index, na_rep="", date_format=date_format, lineterminator="\n")
+    return buffer.getvalue()
+
+
+def records_to_csv(records, columns, header=None):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(header or columns)
+    if len(columns) == 1:
+        writer.writerows(zip(map(itemgetter(columns[0]), records)))
+    else:
+        writer.writerows(map(itemgetter(*columns), records))
+    return buffer.getvalue()
@@ -0,0 +1,57 @@
+import signal
+import threading
+import time
+
+
+# Einfacher Scheduler für den Daemon-Modus: Aufgaben laufen nacheinander im Hauptthread.
+# Dauert eine Aufgabe länger als ihr Intervall, werden verpasste Läufe übersprungen statt nachgeholt.
+class Scheduler:
+    def __init__(self):
+        self.tasks = []
+        self.stop_event = threading.Event()
+
+    def add(self, name, interval, fn):
+        self.tasks.append({"name": name, "interval": max(1, interval), "fn": fn, "next_run": time.monotonic()})
+
+    def stop(self, *_):
+        if not self.stop_event.is_set():
+            print("🛑 Beenden angefordert, laufende Aufgabe wird noch abgeschlossen...")
+        self.stop_event.set()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def _run_task(self, task):
+        start = time.monotonic()
+        print(f"🔄 Starte {task['name']}...")
+        try:
+            task["fn"]()
+        except Exception as e:
+            print(f"❌ {task['name']} fehlgeschlagen: {e}")
+        finished = time.monotonic()
+        print(f"✅ {task['name']} nach {finished - start:.1f} s beendet")
+
+        # Nächsten Termin im festen Raster planen; verpasste Termine werden nicht gestapelt
+        task["next_run"] += task["interval"]
+        skipped = 0
+        while task["next_run"] <= finished:
+            task["next_run"] += task["interval"]
+            skipped += 1
+        if skipped:
+            print(f"⏭️ {task['name']}: {skipped} verpasste(r) Lauf/Läufe übersprungen")
+
+    def run(self):
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            for task in self.tasks:
+                if self.stop_event.is_set():
+                    break
+                if task["next_run"] <= now:
+                    self._run_task(task)
+            if self.stop_event.is_set():
+                break
+            wait = min(task["next_run"] for task in self.tasks) - time.monotonic()
+            if wait > 0:
+                self.stop_event.wait(wait)
+        print("👋 Daemon beendet")
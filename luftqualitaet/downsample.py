@@ -0,0 +1,74 @@
+import numpy as np
+
+
+# Reduziert die Zeitreihe (Zeitpunkt x Stadt) vor dem Upload, damit Payload und Renderzeit begrenzt bleiben
+
+ROLLUP_FREQ = {"hourly": "1h", "daily": "1D"}
+
+
+# Feste Zeitfenster (stündlich/täglich) mit Mittelwert oder Maximum
+def rollup(pivot, freq="1h", how="mean"):
+    return pivot.resample(freq).agg(how).dropna(how="all")
+
+
+# Largest-Triangle-Three-Buckets: wählt threshold Punkte, die die Form der Kurve erhalten
+def lttb_indices(x, y, threshold):
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket-Grenzen für die n-2 inneren Punkte, plus der letzte Punkt als eigener Bucket
+    every = (n - 2) / (threshold - 2)
+    edges = np.append((np.floor(np.arange(threshold - 1) * every) + 1).astype(np.int64), n)
+
+    # Mittelwerte aller Buckets auf einmal über kumulierte Summen
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    counts = edges[1:] - edges[:-1]
+    avg_x = (cx[edges[1:]] - cx[edges[:-1]]) / counts
+    avg_y = (cy[edges[1:]] - cy[edges[:-1]]) / counts
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - avg_x[i + 1]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y[i + 1] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+# LTTB je Stadt; die Tabelle enthält alle Zeitpunkte, die mindestens eine Reihe ausgewählt hat,
+# nicht ausgewählte Werte bleiben leer, damit jede Reihe höchstens max_points Werte behält
+def lttb(pivot, max_points):
+    if len(pivot) <= max_points:
+        return pivot
+    values = pivot.to_numpy(dtype=np.float64)
+    x_all = pivot.index.asi8
+    keep = np.zeros(values.shape, dtype=bool)
+    for col in range(values.shape[1]):
+        valid = np.flatnonzero(~np.isnan(values[:, col]))
+        if len(valid) == 0:
+            continue
+        chosen = lttb_indices(x_all[valid], values[valid, col], max_points)
+        keep[valid[chosen], col] = True
+    rows = keep.any(axis=1)
+    return pivot[rows].where(keep[rows])
+
+
+# mode: "none", "hourly", "daily" oder "lttb"; max_points begrenzt die Punkte pro Reihe in jedem Modus
+def downsample(pivot, mode="lttb", max_points=1000, how="mean"):
+    if mode == "none" or pivot.empty:
+        return pivot
+    if mode in ROLLUP_FREQ:
+        pivot = rollup(pivot, ROLLUP_FREQ[mode], how)
+    elif mode != "lttb":
+        raise ValueError(f"Unbekannter Downsampling-Modus: {mode}")
+    return lttb(pivot, max_points)
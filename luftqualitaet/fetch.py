@@ -0,0 +1,88 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Token-Bucket: erlaubt im Mittel `rate` Anfragen pro Sekunde mit kurzen Spitzen bis `capacity`
+class TokenBucket:
+    def __init__(self, rate, capacity=None, max_rate=None):
+        self.rate = float(rate)
+        self.max_rate = float(max_rate if max_rate is not None else rate)
+        self.min_rate = min(self.rate, 0.1)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        # Blockiert nur so lange, bis wieder ein Token verfügbar ist (kein fester Sleep)
+        while True:
+            with self.lock:
+                self._refill()
+                pause = self.blocked_until - time.monotonic()
+                if pause <= 0 and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = pause if pause > 0 else (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    # 429: Rate halbieren und bei Retry-After bis dahin gar keine Tokens ausgeben
+    def throttle(self, retry_after=None):
+        with self.lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    # Erfolg: Rate schrittweise wieder bis zum konfigurierten Wert anheben
+    def recover(self, step=0.1):
+        with self.lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + step * self.max_rate)
+
+
+# Vom Aufrufer bewusst ausgelassener Abruf (Quote erschöpft, Circuit Breaker offen) – kein Fehler
+class FetchSkipped(Exception):
+    pass
+
+
+# Ruft fetch_fn(city) für alle Städte parallel auf und gibt die Ergebnisse in Städte-Reihenfolge zurück
+# check(city) darf vor dem Warten auf ein Token FetchSkipped auslösen
+def fetch_all(cities, fetch_fn, max_workers=4, rate=5, burst=None, bucket=None, check=None):
+    bucket = bucket or TokenBucket(rate, burst)
+    errors = {}
+    skipped = []
+
+    def fetch_one(city):
+        try:
+            if check is not None:
+                check(city)
+            bucket.acquire()
+            print(f"Abrufe Luftqualität für {city}...")
+            return fetch_fn(city)
+        except FetchSkipped as e:
+            skipped.append(city)
+            print(f"⏭️ {city} übersprungen: {e}")
+            return None
+        except Exception as e:
+            print(f"Fehler bei {city}: {e}")
+            errors[city] = str(e)
+            return None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        results = list(pool.map(fetch_one, cities))
+    elapsed = time.perf_counter() - start
+
+    data_list = [r for r in results if r is not None]
+    print(f"⏱️ {len(data_list)}/{len(cities)} Städte in {elapsed:.2f} s abgerufen "
+          f"({max_workers} parallel, max. {bucket.rate:.3g} Anfragen/s"
+          f"{f', {len(skipped)} übersprungen' if skipped else ''})")
+    return data_list, errors, elapsed
@@ -0,0 +1,140 @@
+import math
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from luftqualitaet.config import GRID_MAX_DISTANCE_KM, GRID_POWER, GRID_WIDTH
+from luftqualitaet.hashes import digest
+from luftqualitaet.output import ASSETS_DIR, output_path, write_atomic
+
+
+# Flächige AQI-Schätzung für die Leaflet-Karte: Inverse Distanzgewichtung (IDW) der Stadtwerte auf ein
+# regelmäßiges Raster über Deutschland, als PNG-Overlay. Die Zeilen liegen gleichmäßig in Web-Mercator,
+# damit L.imageOverlay das Bild ohne Verzerrung über die Grenzen legen kann.
+BOUNDS = (47.2, 5.8, 55.1, 15.1)  # Süd, West, Nord, Ost
+# Farbverlauf nach AQI, passend zu den Markerfarben (grün < 50, orange < 100, rot darüber)
+PALETTE = [
+    (0, (0, 160, 80)),
+    (50, (255, 222, 51)),
+    (100, (255, 153, 51)),
+    (150, (204, 0, 51)),
+    (200, (102, 0, 153)),
+    (300, (126, 0, 35)),
+]
+# Obergrenze für Zwischenergebnisse (Rasterpunkte x Stationen) pro Block
+CHUNK_ELEMENTS = 4_000_000
+
+
+def _mercator_y(lat):
+    return np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))
+
+
+def _latitude(y):
+    return np.degrees(2 * np.arctan(np.exp(y)) - np.pi / 2)
+
+
+# Rasterpunkte (Mittelpunkte der Pixel) für die gegebene Breite; die Höhe folgt aus dem Mercator-Seitenverhältnis
+def grid_points(width, bounds=BOUNDS):
+    south, west, north, east = bounds
+    y_min, y_max = _mercator_y(south), _mercator_y(north)
+    height = max(1, round(width * (y_max - y_min) / np.radians(east - west)))
+    lons = west + (np.arange(width) + 0.5) * (east - west) / width
+    lats = _latitude(y_max - (np.arange(height) + 0.5) * (y_max - y_min) / height)
+    return lats, lons
+
+
+# IDW mit Potenz `power` in lokal ebenen Kilometern; liefert Werte und Abstand zur nächsten Station.
+# Die Rasterzeilen werden blockweise verarbeitet, damit der Speicher auch bei vielen Stationen begrenzt bleibt.
+def idw(lats, lons, station_lats, station_lons, values, power=2):
+    station_lats = np.asarray(station_lats, dtype=float)
+    station_lons = np.asarray(station_lons, dtype=float)
+    values = np.asarray(values, dtype=float)
+    km_lat = 110.57
+    km_lon = 111.32 * math.cos(math.radians(float(np.mean(lats))))
+    # Quadrierte Abstände getrennt nach Spalten und Zeilen; pro Block wird nur noch addiert
+    dx2 = ((lons[:, None] - station_lons) * km_lon) ** 2
+    dy2 = ((lats[:, None] - station_lats) * km_lat) ** 2
+
+    result = np.empty((len(lats), len(lons)))
+    nearest = np.empty((len(lats), len(lons)))
+    rows_per_chunk = max(1, CHUNK_ELEMENTS // (len(lons) * len(values)))
+    for start in range(0, len(lats), rows_per_chunk):
+        block = slice(start, start + rows_per_chunk)
+        # (Zeilen, Spalten, Stationen)
+        d2 = dy2[block, None, :] + dx2[None, :, :]
+        exact = d2 < 1e-12
+        safe = np.maximum(d2, 1e-12)
+        weights = 1.0 / safe if power == 2 else safe ** (-power / 2)
+        estimate = (weights @ values) / weights.sum(axis=2)
+        # Rasterpunkt liegt genau auf einer Station: deren Wert statt Division durch null
+        hit = exact.any(axis=2)
+        if hit.any():
+            estimate[hit] = values[exact[hit].argmax(axis=1)]
+        result[block] = estimate
+        nearest[block] = np.sqrt(d2.min(axis=2))
+    return result, nearest
+
+
+# Werte in RGBA; weit entfernt von jeder Station wird die Fläche transparent (Schätzung ohne Aussagekraft)
+def colorize(values, nearest, max_distance=GRID_MAX_DISTANCE_KM, opacity=170):
+    stops = [stop for stop, _ in PALETTE]
+    rgba = np.empty(values.shape + (4,), dtype=np.uint8)
+    for channel in range(3):
+        rgba[..., channel] = np.interp(values, stops, [color[channel] for _, color in PALETTE]).round()
+    fade = np.clip((max_distance - nearest) / (max_distance / 2), 0, 1)
+    rgba[..., 3] = (fade * opacity).round()
+    return rgba
+
+
+# Minimaler PNG-Encoder (RGBA, 8 Bit) mit zlib; Filter "Sub" pro Zeile verbessert die Kompression
+# bei weichen Verläufen deutlich und ist vektorisiert. Stufe 9 spart gegenüber 6 nur gut 10 % bei
+# etwa zehnfacher Laufzeit.
+def encode_png(rgba, level=6):
+    height, width, _ = rgba.shape
+    filtered = rgba.astype(np.int16)
+    filtered[:, 1:] -= rgba[:, :-1]
+    rows = np.empty((height, 1 + width * 4), dtype=np.uint8)
+    rows[:, 0] = 1
+    rows[:, 1:] = (filtered % 256).astype(np.uint8).reshape(height, width * 4)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(rows.tobytes(), level)) + chunk(b"IEND", b""))
+
+
+def render_grid(stations, width=GRID_WIDTH, power=GRID_POWER, max_distance=GRID_MAX_DISTANCE_KM, bounds=BOUNDS):
+    lats, lons = grid_points(width, bounds)
+    values, nearest = idw(lats, lons, [s["lat"] for s in stations], [s["lon"] for s in stations],
+                          [s["aqi"] for s in stations], power)
+    return encode_png(colorize(values, nearest, max_distance))
+
+
+# Schreibt das AQI-Raster als Asset, dessen Name aus den Eingaben (Stationen, Werte, Parameter) abgeleitet ist:
+# gleiche Eingaben ergeben dieselbe Datei, die dann weder neu berechnet noch neu geschrieben wird.
+# Liefert {"url", "bounds"} für die Karte oder None ohne verwertbare Messwerte.
+def write_aqi_grid(data_list, coords):
+    stations = [
+        {"lat": coords[entry["city"]][0], "lon": coords[entry["city"]][1], "aqi": float(entry["aqi"])}
+        for entry in data_list
+        if entry["city"] in coords and entry.get("aqi") is not None
+    ]
+    if not stations:
+        return None
+    key = digest(sorted((s["lat"], s["lon"], s["aqi"]) for s in stations),
+                 GRID_WIDTH, GRID_POWER, GRID_MAX_DISTANCE_KM, BOUNDS, PALETTE)
+    url = f"{ASSETS_DIR}/aqi-grid.{key[:12]}.png"
+    path = output_path(url)
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        png = render_grid(stations)
+        write_atomic(path, png)
+        print(f"🌡️ AQI-Raster aus {len(stations)} Städten erzeugt ({GRID_WIDTH} px breit, "
+              f"{len(png) / 1024:.0f} KiB, {time.perf_counter() - start:.2f} s)")
+    south, west, north, east = BOUNDS
+    return {"url": url, "bounds": [[south, west], [north, east]]}
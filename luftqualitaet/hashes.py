@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import threading
+
+from luftqualitaet.output import temp_name, write_file
+
+
+# Merkt sich Prüfsummen der Eingaben jedes Schritts (Chart-CSV + Metadaten, erzeugte Dateien).
+# Sind die Eingaben identisch zum letzten Lauf, wird der Schritt übersprungen.
+class ContentHashes:
+    def __init__(self, path="data/content_hashes.json"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.digests = None
+        self.skipped = []
+        self.saved_requests = 0
+
+    def _load(self):
+        if self.digests is not None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.digests = json.load(f)
+        except FileNotFoundError:
+            self.digests = {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Prüfsummen {self.path} nicht lesbar, starte leer: {e}")
+            self.digests = {}
+
+    def save(self):
+        with self.lock:
+            self._load()
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = temp_name(self.path)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.digests, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def unchanged(self, key, digest):
+        with self.lock:
+            self._load()
+            return self.digests.get(key) == digest
+
+    def record(self, key, digest):
+        with self.lock:
+            self._load()
+            self.digests[key] = digest
+
+    def forget(self, key):
+        with self.lock:
+            self._load()
+            self.digests.pop(key, None)
+
+    def skip(self, key, saved_requests=0):
+        with self.lock:
+            self.skipped.append(key)
+            self.saved_requests += saved_requests
+
+    # Gibt die im Lauf eingesparte Arbeit aus und setzt die Zähler zurück
+    def report(self):
+        with self.lock:
+            skipped, saved = self.skipped, self.saved_requests
+            self.skipped, self.saved_requests = [], 0
+        if skipped:
+            print(f"💾 Unverändert übersprungen: {len(skipped)} Schritte ({', '.join(skipped)}), {saved} API-Aufrufe gespart")
+        else:
+            print("💾 Keine unveränderten Schritte übersprungen")
+        return skipped, saved
+
+
+def digest(*parts):
+    sha = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        elif isinstance(part, str):
+            data = part.encode("utf-8")
+        else:
+            data = json.dumps(part, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        sha.update(len(data).to_bytes(8, "big"))
+        sha.update(data)
+    return sha.hexdigest()
+
+
+# Schreibt eine Datei nur, wenn sich ihr Inhalt seit dem letzten Schreiben geändert hat
+# (atomar und mit .gz/.br-Geschwistern, siehe output.write_file)
+def write_if_changed(hashes, path, content):
+    content_digest = digest(content)
+    if os.path.exists(path) and hashes.unchanged(f"file:{path}", content_digest):
+        hashes.skip(path)
+        return False
+    write_file(path, content)
+    hashes.record(f"file:{path}", content_digest)
+    return True
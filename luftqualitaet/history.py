@@ -0,0 +1,263 @@
+import fcntl
+import glob
+import os
+import shutil
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+# Gleiche Spalten wie der bisherige CSV-Header, aber typisiert
+COLUMNS = ["timestamp", "city", "aqi", "pm25", "pm10", "co", "no2", "so2", "o3"]
+SCHEMA = pa.schema([
+    ("timestamp", pa.timestamp("s")),
+    ("city", pa.string()),
+    ("aqi", pa.float64()),
+    ("pm25", pa.float64()),
+    ("pm10", pa.float64()),
+    ("co", pa.float64()),
+    ("no2", pa.float64()),
+    ("so2", pa.float64()),
+    ("o3", pa.float64()),
+    # Commit-Nummer des Batches, mit dem die Zeile in den Store kam (ältere Dateien: leer)
+    ("seq", pa.int64()),
+])
+
+
+# Messhistorie als Parquet-Dateien, partitioniert nach Tag: <root>/date=YYYY-MM-DD/*.parquet
+# Jeder Batch bekommt eine fortlaufende Commit-Nummer (Spalte seq); <root>/.commits hält pro Commit die
+# berührten Tage fest. Abgeleitete Zustände merken sich die zuletzt übernommene Nummer statt des
+# neuesten Zeitstempels, damit auch verspätet geschriebene ältere Messungen erfasst werden.
+class HistoryStore:
+    def __init__(self, root="data/history", compression="zstd"):
+        self.root = root
+        self.compression = compression
+
+    def _partition_dir(self, day):
+        return os.path.join(self.root, f"date={day}")
+
+    def _segments(self, day):
+        return sorted(glob.glob(os.path.join(self._partition_dir(day), "*.parquet")))
+
+    def _tmp_path(self, path):
+        return os.path.join(os.path.dirname(path), f".tmp-{os.path.basename(path)}")
+
+    def _write(self, table, path):
+        # Erst in eine temporäre Datei schreiben, dann umbenennen – Leser sehen nie halbe Dateien
+        tmp_path = self._tmp_path(path)
+        pq.write_table(table, tmp_path, compression=self.compression)
+        os.replace(tmp_path, path)
+
+    # Sperrdatei für den ganzen Store: Leser teilen sie, Commits und die Kompaktierung brauchen sie exklusiv.
+    @contextmanager
+    def _locked(self, exclusive=False, blocking=True):
+        os.makedirs(self.root, exist_ok=True)
+        f = open(os.path.join(self.root, ".lock"), "a")
+        try:
+            flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            try:
+                fcntl.flock(f, flags if blocking else flags | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            yield True
+        finally:
+            f.close()
+
+    def _log_path(self):
+        return os.path.join(self.root, ".commits")
+
+    # Commits nach `after` als [(seq, [tage])], aufsteigend
+    def _commits(self, after=0):
+        commits = []
+        try:
+            with open(self._log_path(), "r", encoding="utf-8") as f:
+                for line in f:
+                    seq, _, days = line.strip().partition(" ")
+                    if seq and int(seq) > after:
+                        commits.append((int(seq), days.split(",")))
+        except FileNotFoundError:
+            pass
+        return commits
+
+    # Letzte vergebene Commit-Nummer; liest nur das Ende des Protokolls
+    def _last_sequence(self):
+        try:
+            with open(self._log_path(), "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - 4096))
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return 0
+        return int(lines[-1].split(b" ")[0]) if lines else 0
+
+    def sequence(self):
+        with self._locked():
+            return self._last_sequence()
+
+    def days(self, start=None, end=None):
+        start_day = _day(start) if start is not None else None
+        end_day = _day(end) if end is not None else None
+        result = []
+        for path in sorted(glob.glob(os.path.join(self.root, "date=*"))):
+            day = os.path.basename(path)[len("date="):]
+            if start_day and day < start_day:
+                continue
+            if end_day and day > end_day:
+                continue
+            result.append(day)
+        return result
+
+    def append(self, rows):
+        if isinstance(rows, pd.DataFrame):
+            df = rows[COLUMNS].copy()
+        else:
+            df = pd.DataFrame(rows, columns=COLUMNS)
+        if df.empty:
+            return 0
+        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        # Jeder Schreiber legt pro Partition ein eigenes Segment an; Parquet-Dateien werden nie verändert.
+        # Der ganze Commit läuft unter der exklusiven Sperre: Leser sehen einen Batch ganz oder gar nicht,
+        # und die Commit-Nummern sind in der Reihenfolge vergeben, in der Batches sichtbar werden.
+        batch = f"{datetime.now():%Y%m%d%H%M%S}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        with self._locked(exclusive=True):
+            df["seq"] = sequence = self._last_sequence() + 1
+            staged = []
+            try:
+                for day, part in df.groupby(df["timestamp"].dt.strftime("%Y-%m-%d")):
+                    table = pa.Table.from_pandas(part, schema=SCHEMA, preserve_index=False)
+                    os.makedirs(self._partition_dir(day), exist_ok=True)
+                    path = os.path.join(self._partition_dir(day), f"part-{batch}.parquet")
+                    pq.write_table(table, self._tmp_path(path), compression=self.compression)
+                    staged.append((day, path))
+            except Exception:
+                for _, path in staged:
+                    os.remove(self._tmp_path(path))
+                raise
+            # Erst protokollieren, dann freigeben: nach einem Absturz dazwischen fehlen höchstens Zeilen
+            # zu einer Nummer, eine Nummer wird aber nie doppelt vergeben
+            with open(self._log_path(), "a", encoding="utf-8") as f:
+                f.write(f"{sequence} {','.join(day for day, _ in staged)}\n")
+            for _, path in staged:
+                os.replace(self._tmp_path(path), path)
+        return len(df)
+
+    def _scan(self, days, columns, condition):
+        files = []
+        for day in days:
+            files.extend(self._segments(day))
+        if not files:
+            return SCHEMA.empty_table().to_pandas()[columns]
+        dataset = ds.dataset(files, schema=SCHEMA, format="parquet")
+        return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+    # Liest nur die Partitionen, die den Zeitraum [start, end] berühren. Die geteilte Sperre hält
+    # die Kompaktierung fern, sonst würden Segmente und ihre kompaktierte Fassung doppelt oder gar
+    # nicht gelesen.
+    def read(self, start=None, end=None, columns=None):
+        condition = None
+        if start is not None:
+            condition = ds.field("timestamp") >= pd.Timestamp(start).to_pydatetime()
+        if end is not None:
+            upper = ds.field("timestamp") <= pd.Timestamp(end).to_pydatetime()
+            condition = upper if condition is None else condition & upper
+        with self._locked():
+            return self._scan(self.days(start, end), columns or COLUMNS, condition)
+
+    # Alle Zeilen aus Commits nach `after`, unabhängig von ihrem Zeitstempel, und die neueste Commit-Nummer.
+    # Gelesen werden nur die Tage, die diese Commits berührt haben.
+    def read_since(self, after, columns=None):
+        with self._locked():
+            commits = self._commits(after)
+            if not commits:
+                return self._scan([], columns or COLUMNS, None), after
+            touched = sorted({day for _, days in commits for day in days})
+            return self._scan(touched, columns or COLUMNS, ds.field("seq") > after), commits[-1][0]
+
+    # Fasst alle Segmente eines Tages in einer Datei zusammen. Läuft bereits eine Kompaktierung
+    # (anderer Prozess) oder wird gerade gelesen, wird der Tag übersprungen statt gewartet.
+    def compact(self, day, blocking=False):
+        if len(self._segments(day)) < 2:
+            return False
+        with self._locked(exclusive=True, blocking=blocking) as locked:
+            if not locked:
+                return False
+            self._remove_stale_tmp(day)
+            # Neu hinzukommende Segmente anderer Schreiber bleiben unberührt und werden später erfasst
+            segments = self._segments(day)
+            if len(segments) < 2:
+                return False
+            # Doppelte (timestamp, city) fallen weg; die stabile Sortierung lässt die ältere Datei gewinnen
+            # (compact-* vor part-*, Segmente nach Schreibzeit)
+            table = ds.dataset(segments, schema=SCHEMA, format="parquet").to_table()
+            table = table.sort_by([("timestamp", "ascending"), ("city", "ascending")])
+            df = table.to_pandas()
+            if df.duplicated(["timestamp", "city"]).any():
+                df = df.drop_duplicates(["timestamp", "city"])
+                table = pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+            self._write(table, os.path.join(self._partition_dir(day), f"compact-{uuid.uuid4().hex[:8]}.parquet"))
+            for path in segments:
+                os.remove(path)
+        return True
+
+    # Zeilenzahl aus den Parquet-Metadaten, ohne die Daten zu lesen
+    def count_rows(self, days):
+        with self._locked():
+            return sum(pq.ParquetFile(path).metadata.num_rows for day in days for path in self._segments(day))
+
+    # Temporäre Dateien abgebrochener Schreibvorgänge aufräumen
+    def _remove_stale_tmp(self, day, max_age=3600):
+        for path in glob.glob(os.path.join(self._partition_dir(day), ".tmp-*")):
+            try:
+                if time.time() - os.path.getmtime(path) > max_age:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    # Abgeschlossene Tage (vor `before`) kompaktieren, damit pro Tag nur eine Datei gelesen wird
+    def compact_before(self, before):
+        compacted = 0
+        for day in self.days(end=before):
+            if day < _day(before) and self.compact(day):
+                compacted += 1
+        return compacted
+
+
+def _day(value):
+    if isinstance(value, str) and len(value) == 10:
+        return value
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+# Einmalige Übernahme der alten Tagesdateien data/YYYY-MM-DD.csv in den Parquet-Store
+def migrate_csv_files(store, pattern="data/*.csv", archive_dir="data/legacy_csv"):
+    files = sorted(glob.glob(pattern))
+    migrated_rows = 0
+    for file in files:
+        df = pd.read_csv(file)
+        migrated_rows += store.append(df)
+        day = os.path.splitext(os.path.basename(file))[0]
+        store.compact(day, blocking=True)
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+            shutil.move(file, os.path.join(archive_dir, os.path.basename(file)))
+    if files:
+        print(f"📦 {len(files)} CSV-Dateien ({migrated_rows} Zeilen) in {store.root} übernommen")
+    return migrated_rows
+
+
+if __name__ == "__main__":
+    # python -m luftqualitaet.history migrate [glob] [ziel]
+    if len(sys.argv) < 2 or sys.argv[1] != "migrate":
+        print("Verwendung: python -m luftqualitaet.history migrate [data/*.csv] [data/history]")
+        sys.exit(1)
+    pattern = sys.argv[2] if len(sys.argv) > 2 else "data/*.csv"
+    root = sys.argv[3] if len(sys.argv) > 3 else "data/history"
+    migrate_csv_files(HistoryStore(root), pattern)
@@ -0,0 +1,110 @@
+import argparse
+import glob
+import os
+
+from luftqualitaet import client
+from luftqualitaet.charts import publish_charts
+from luftqualitaet.collector import collect
+from luftqualitaet.config import COLLECT_INTERVAL, PUBLISH_INTERVAL, RENDER_INTERVAL
+from luftqualitaet.daemon import Scheduler
+from luftqualitaet.render import render_pages
+from luftqualitaet.stores import get_chart_registry, get_content_hashes, get_history, get_metrics, get_stats_state
+from luftqualitaet.summary import start_ai_summary
+
+
+def prepare():
+    os.makedirs("data", exist_ok=True)
+    # Alte Tagesdateien data/YYYY-MM-DD.csv einmalig übernehmen
+    if glob.glob("data/*.csv"):
+        from luftqualitaet.history import migrate_csv_files
+
+        migrate_csv_files(get_history(), "data/*.csv")
+    if os.getenv("CHART_REGISTRY_REBUILD") == "1":
+        print("♻️ Chart-Registry wird neu aufgebaut, alle Charts werden neu angelegt")
+        get_chart_registry().clear()
+
+
+# Kennzahlen der gesamten Historie (inkrementell); ein Fehler hier soll den Lauf nicht aufhalten
+def compute_stats():
+    from luftqualitaet import stats
+
+    try:
+        return stats.compute_stats(get_stats_state(), get_history())
+    except Exception as e:
+        print(f"⚠️ Statistik konnte nicht berechnet werden: {e}")
+        return None
+
+
+def run_once():
+    metrics = get_metrics()
+    prepare()
+    try:
+        with metrics.stage("sammeln"):
+            timestamp, data_list = collect()
+        with metrics.stage("statistik"):
+            stats = compute_stats()
+        # AI-Zusammenfassung läuft parallel zum Veröffentlichen der Charts
+        summary_job = start_ai_summary(data_list, stats)
+        with metrics.stage("veröffentlichen"):
+            chart_urls = publish_charts(data_list, stats)
+        with metrics.stage("zusammenfassung"):
+            ai_summary = summary_job.result()
+        with metrics.stage("rendern"):
+            render_pages(data_list, chart_urls, timestamp, ai_summary, stats)
+        get_content_hashes().report()
+    finally:
+        metrics.write()
+
+
+# Bleibt resident und plant Sammeln, Veröffentlichen und Rendern selbst ein
+def run_daemon():
+    prepare()
+    state = {"timestamp": None, "data_list": None, "chart_urls": {}, "ai_summary": None, "stats": None}
+    metrics = get_metrics()
+
+    def collect_task():
+        with metrics.stage("sammeln"):
+            state["timestamp"], state["data_list"] = collect()
+        with metrics.stage("statistik"):
+            state["stats"] = compute_stats()
+
+    def publish_task():
+        if not state["data_list"]:
+            print("⏭️ Keine Messdaten vorhanden, Veröffentlichen übersprungen")
+            return
+        summary_job = start_ai_summary(state["data_list"], state["stats"])
+        with metrics.stage("veröffentlichen"):
+            state["chart_urls"] = publish_charts(state["data_list"], state["stats"])
+        with metrics.stage("zusammenfassung"):
+            state["ai_summary"] = summary_job.result()
+
+    def render_task():
+        if not state["data_list"]:
+            print("⏭️ Keine Messdaten vorhanden, Rendern übersprungen")
+            return
+        try:
+            with metrics.stage("rendern"):
+                render_pages(state["data_list"], state["chart_urls"], state["timestamp"], state["ai_summary"], state["stats"])
+            get_content_hashes().report()
+        finally:
+            metrics.write()
+
+    scheduler = Scheduler()
+    scheduler.add("sammeln", COLLECT_INTERVAL, collect_task)
+    scheduler.add("veröffentlichen", PUBLISH_INTERVAL, publish_task)
+    scheduler.add("rendern", RENDER_INTERVAL, render_task)
+    scheduler.install_signal_handlers()
+    try:
+        scheduler.run()
+    finally:
+        client.close_sessions()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Luftqualitätsdaten sammeln und Dashboard erzeugen")
+    parser.add_argument("--daemon", action="store_true", help="resident laufen und Läufe selbst einplanen")
+    args = parser.parse_args(argv)
+    if args.daemon:
+        run_daemon()
+    else:
+        run_once()
@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+PREFIX = "luftqualitaet_"
+
+# Kurzbeschreibungen für die Prometheus-Ausgabe
+HELP = {
+    "stage_seconds": "Dauer der Pipeline-Schritte",
+    "stage_last_seconds": "Dauer des letzten Laufs eines Pipeline-Schritts",
+    "stage_errors_total": "Fehlgeschlagene Pipeline-Schritte",
+    "chart_stage_seconds": "Dauer der Schritte beim Veröffentlichen eines Charts",
+    "http_requests_total": "Ausgehende HTTP-Anfragen nach API, Methode und Statuscode",
+    "http_request_seconds": "Dauer ausgehender HTTP-Anfragen",
+    "http_retries_total": "Wiederholte HTTP-Anfragen nach Grund",
+    "http_bytes_sent_total": "Gesendete Bytes (Request-Body)",
+    "http_bytes_received_total": "Empfangene Bytes (Response-Body)",
+    "ninjas_cache_hits_total": "Städte aus dem Antwort-Cache (noch nicht fällig)",
+    "ninjas_cache_misses_total": "Bei API Ninjas abgerufene Städte",
+}
+
+
+# Zähler, Summaries (Anzahl/Summe/Maximum) und Gauges für einen Prozess; threadsicher,
+# damit Chart-Pipeline und Abruf-Threads gleichzeitig schreiben können.
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.summaries = {}
+        self.gauges = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            summary = self.summaries.setdefault(key, [0, 0.0, 0.0])
+            summary[0] += 1
+            summary[1] += value
+            summary[2] = max(summary[2], value)
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    # Misst einen Pipeline-Schritt; Fehler werden gezählt und weitergereicht
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc("stage_errors_total", stage=name)
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            self.observe("stage_seconds", seconds, stage=name)
+            self.set("stage_last_seconds", seconds, stage=name)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "generated_at": time.time(),
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                "summaries": [
+                    {"name": name, "labels": dict(labels), "count": s[0], "sum": round(s[1], 6), "max": round(s[2], 6)}
+                    for (name, labels), s in sorted(self.summaries.items())
+                ],
+                "gauges": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.gauges.items())
+                ],
+            }
+
+    def prometheus(self):
+        snapshot = self.snapshot()
+        lines = []
+        seen = set()
+
+        def header(name, kind):
+            if name not in seen:
+                seen.add(name)
+                if name in HELP:
+                    lines.append(f"# HELP {PREFIX}{name} {HELP[name]}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for item in snapshot["counters"]:
+            header(item["name"], "counter")
+            lines.append(f"{PREFIX}{item['name']}{_labels(item['labels'])} {item['value']}")
+        for item in snapshot["summaries"]:
+            header(item["name"], "summary")
+            lines.append(f"{PREFIX}{item['name']}_count{_labels(item['labels'])} {item['count']}")
+            lines.append(f"{PREFIX}{item['name']}_sum{_labels(item['labels'])} {item['sum']}")
+        for item in snapshot["summaries"]:
+            header(item["name"] + "_max", "gauge")
+            lines.append(f"{PREFIX}{item['name']}_max{_labels(item['labels'])} {item['max']}")
+        for item in snapshot["gauges"]:
+            header(item["name"], "gauge")
+            lines.append(f"{PREFIX}{item['name']}{_labels(item['labels'])} {item['value']}")
+        return "\n".join(lines) + "\n"
+
+    # metrics.json und metrics.txt (Prometheus-Textformat) neben index.html schreiben
+    def write(self):
+        from luftqualitaet.output import output_path, write_file
+
+        write_file(output_path("metrics.json"), json.dumps(self.snapshot(), ensure_ascii=False, indent=2))
+        write_file(output_path("metrics.txt"), self.prometheus())
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
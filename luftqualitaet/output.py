@@ -0,0 +1,77 @@
+import glob
+import gzip
+import hashlib
+import os
+import time
+import uuid
+
+from luftqualitaet.config import ASSET_MAX_AGE, OUTPUT_DIR
+
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+ASSETS_DIR = "assets"
+
+
+def output_path(name):
+    return os.path.join(OUTPUT_DIR, name)
+
+
+# Eindeutiger temporärer Name im selben Ordner (Prozess + Zufall): gleichzeitige Schreiber (Daemon,
+# Backfill, manueller Lauf) überschreiben sich nicht gegenseitig die halb geschriebene Datei
+def temp_name(path):
+    return os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp")
+
+
+# Temporäre Datei im selben Ordner + os.replace: nginx sieht nie eine halb geschriebene Datei
+def write_atomic(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = temp_name(path)
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# Schreibt die Datei samt vorkomprimierten Geschwistern .gz (und .br, falls brotli installiert ist)
+# für gzip_static/brotli_static in nginx. fast=True für viele kleine Dateien (Zeitreihen-Shards):
+# brotli mit höchster Stufe kostet sonst ein Vielfaches der eigentlichen Arbeit.
+def write_file(path, content, fast=False):
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    # mtime=0, damit gleicher Inhalt auch byte-identische .gz-Dateien ergibt
+    write_atomic(path + ".gz", gzip.compress(data, compresslevel=6 if fast else 9, mtime=0))
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    if brotli is not None:
+        write_atomic(path + ".br", brotli.compress(data, quality=5 if fast else 11))
+    write_atomic(path, data)
+
+
+# Statische Datei aus luftqualitaet/static als assets/<name>.<hash>.<ext> veröffentlichen;
+# liefert den relativen Pfad für HTML. Der Name ändert sich nur mit dem Inhalt.
+def publish_asset(name, content=None):
+    if content is None:
+        with open(os.path.join(STATIC_DIR, name), "rb") as f:
+            content = f.read()
+    stem, ext = os.path.splitext(name)
+    url = f"{ASSETS_DIR}/{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+    path = output_path(url)
+    if not os.path.exists(path):
+        write_file(path, content)
+    return url
+
+
+# Alte Asset-Versionen entfernen; zwischengespeicherte Seiten dürfen sie noch eine Weile referenzieren
+def prune_assets(keep):
+    keep_paths = {os.path.normpath(output_path(url)) for url in keep}
+    now = time.time()
+    removed = 0
+    for path in glob.glob(os.path.join(output_path(ASSETS_DIR), "*")):
+        base = path[:-3] if path.endswith((".gz", ".br")) else path
+        if os.path.normpath(base) in keep_paths:
+            continue
+        if now - os.path.getmtime(path) > ASSET_MAX_AGE:
+            os.remove(path)
+            removed += 1
+    if removed:
+        print(f"🧹 {removed} veraltete Asset-Dateien entfernt")
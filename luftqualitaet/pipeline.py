@@ -0,0 +1,51 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+# Misst die Dauer eines Arbeitsschritts und summiert sie in timings[name]
+@contextmanager
+def stage(timings, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+# Führt Chart-Jobs parallel aus; innerhalb eines Jobs bleiben die Schritte sequentiell.
+# jobs: Liste von (key, fn), fn(timings=...) liefert das Ergebnis des Charts.
+def run_chart_pipeline(jobs, max_workers=4):
+    results = {}
+    timings = {}
+    errors = {}
+
+    def run(key, fn):
+        job_timings = {}
+        start = time.perf_counter()
+        try:
+            return fn(timings=job_timings)
+        except Exception as e:
+            print(f"❌ Chart {key} fehlgeschlagen: {e}")
+            errors[key] = str(e)
+            return None
+        finally:
+            job_timings["gesamt"] = time.perf_counter() - start
+            timings[key] = job_timings
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = [(key, pool.submit(run, key, fn)) for key, fn in jobs]
+        for key, future in futures:
+            result = future.result()
+            if result is not None:
+                results[key] = result
+    elapsed = time.perf_counter() - start
+
+    print(f"⏱️ {len(results)}/{len(jobs)} Charts in {elapsed:.2f} s veröffentlicht ({max_workers} parallel)")
+    for key, _ in jobs:
+        job_timings = timings.get(key, {})
+        stages = ", ".join(f"{name} {seconds:.2f} s" for name, seconds in job_timings.items() if name != "gesamt")
+        print(f"   {key}: {job_timings.get('gesamt', 0.0):.2f} s ({stages})")
+    return results, timings, errors
@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from luftqualitaet.fetch import FetchSkipped, TokenBucket
+from luftqualitaet.output import temp_name
+from luftqualitaet.stores import get_metrics
+
+
+class QuotaExhausted(FetchSkipped):
+    pass
+
+
+class CircuitOpen(FetchSkipped):
+    pass
+
+
+# Schutz für API Ninjas: Tagesquote, adaptive Rate (halbiert bei 429, erholt sich bei Erfolg) und
+# Circuit Breaker nach wiederholten Fehlern. Der Zustand überdauert Läufe (data/ninjas_guard.json),
+# damit auch einzelne Cron-Läufe eine offene Sicherung respektieren.
+class ApiGuard:
+    def __init__(self, path, rate, burst=None, daily_quota=0, failure_threshold=5, cooldown=900):
+        self.path = path
+        self.configured_rate = float(rate)
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.lock = threading.RLock()
+        self.probe_done = threading.Condition(self.lock)
+        self.state = {"day": None, "used": 0, "remaining_header": None, "rate": None,
+                      "failures": 0, "opened_at": None, "probing": False}
+        self._load()
+        self.bucket = TokenBucket(self.state["rate"] or self.configured_rate, burst, max_rate=self.configured_rate)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.state.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"⚠️ API-Zustand {self.path} nicht lesbar, starte neu: {e}")
+        self.state["probing"] = False
+
+    def save(self):
+        with self.lock:
+            self.state["rate"] = self.bucket.rate
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = temp_name(self.path)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_path, self.path)
+        self._report()
+
+    def _roll_day(self):
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if self.state["day"] != today:
+            self.state.update({"day": today, "used": 0, "remaining_header": None})
+
+    # Verbleibende Anfragen heute (None = unbegrenzt)
+    def budget(self):
+        with self.lock:
+            self._roll_day()
+            limits = []
+            if self.daily_quota:
+                limits.append(max(0, self.daily_quota - self.state["used"]))
+            if self.state["remaining_header"] is not None:
+                limits.append(self.state["remaining_header"])
+            return min(limits) if limits else None
+
+    def circuit_state(self):
+        with self.lock:
+            if self.state["opened_at"] is None:
+                return "geschlossen"
+            if time.time() - self.state["opened_at"] < self.cooldown:
+                return "offen"
+            return "halboffen"
+
+    # Vor jedem Abruf: bei offener Sicherung oder leerer Quote wird übersprungen.
+    # Halboffen lässt genau einen Probeabruf durch, die übrigen Abrufe warten auf dessen Ergebnis.
+    def check(self, key=None):
+        with self.lock:
+            while True:
+                state = self.circuit_state()
+                if state == "offen":
+                    self.decision("skip_circuit")
+                    raise CircuitOpen("Circuit Breaker offen")
+                if state == "halboffen" and self.state["probing"]:
+                    self.probe_done.wait(30)
+                    continue
+                if state == "halboffen":
+                    self.state["probing"] = True
+                    self.decision("probe")
+                break
+            budget = self.budget()
+            if budget is not None and budget <= 0:
+                self.decision("skip_quota")
+                raise QuotaExhausted("Tagesquote erschöpft")
+
+    # requests-Hook: wird für jede Antwort aufgerufen, also auch für Wiederholungen
+    def on_response(self, response, *args, **kwargs):
+        with self.lock:
+            self._roll_day()
+            self.state["used"] += 1
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            if remaining is not None and remaining.isdigit():
+                self.state["remaining_header"] = int(remaining)
+        if response.status_code == 429:
+            self.bucket.throttle(_seconds(response.headers.get("Retry-After")))
+            self.decision("throttle")
+            print(f"🐢 429 von {response.url.split('?')[0]}: Rate auf {self.bucket.rate:.2f} Anfragen/s gesenkt")
+        return response
+
+    def success(self):
+        with self.lock:
+            if self.state["opened_at"] is not None:
+                print("🔌 Circuit Breaker wieder geschlossen")
+                self.decision("circuit_closed")
+            self.state.update({"failures": 0, "opened_at": None, "probing": False})
+            self.probe_done.notify_all()
+        self.bucket.recover()
+
+    def failure(self, error):
+        with self.lock:
+            self.state["failures"] += 1
+            reopen = self.state["probing"]
+            self.state["probing"] = False
+            if reopen or (self.state["opened_at"] is None and self.state["failures"] >= self.failure_threshold):
+                self.state["opened_at"] = time.time()
+                self.decision("circuit_opened")
+                print(f"🔌 Circuit Breaker geöffnet nach {self.state['failures']} Fehlern ({error}), "
+                      f"Pause {self.cooldown} s")
+            self.probe_done.notify_all()
+
+    def decision(self, name, count=1):
+        if count:
+            get_metrics().inc("ninjas_decisions_total", count, decision=name)
+
+    def _report(self):
+        metrics = get_metrics()
+        budget = self.budget()
+        if budget is not None:
+            metrics.set("ninjas_quota_remaining", budget)
+        metrics.set("ninjas_quota_used", self.state["used"])
+        metrics.set("ninjas_rate_per_second", round(self.bucket.rate, 3))
+        metrics.set("ninjas_circuit_open", 0 if self.circuit_state() == "geschlossen" else 1)
+
+
+def _seconds(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,57 @@
+import json
+import os
+import threading
+
+from luftqualitaet.output import temp_name
+
+
+# Lokales Verzeichnis Chart-Schlüssel -> Datawrapper-Chart, damit Läufe bestehende Charts aktualisieren
+class ChartRegistry:
+    def __init__(self, path="data/charts.json"):
+        self.path = path
+        self.lock = threading.RLock()
+        self.charts = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Chart-Registry {self.path} nicht lesbar, starte leer: {e}")
+            return {}
+
+    # Charts werden parallel veröffentlicht, daher sind alle Zugriffe gesperrt
+    def save(self):
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = temp_name(self.path)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.charts, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.charts.get(key)
+            return dict(entry) if entry is not None else None
+
+    def set(self, key, chart_id, **info):
+        with self.lock:
+            self.charts[key] = {"id": chart_id, **info}
+            self.save()
+
+    def update(self, key, **info):
+        with self.lock:
+            self.charts[key].update(info)
+            self.save()
+
+    def remove(self, key):
+        with self.lock:
+            if self.charts.pop(key, None) is not None:
+                self.save()
+
+    def clear(self):
+        with self.lock:
+            self.charts = {}
+            self.save()
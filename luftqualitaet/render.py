@@ -0,0 +1,360 @@
+import html
+import json
+import re
+import time
+from datetime import datetime
+
+from luftqualitaet import client
+from luftqualitaet.charts import chart_keys
+from luftqualitaet.config import HEADERS_DW, STATUS_BARS, STATUS_HISTORY_DIR, STATUS_HISTORY_SIZE
+from luftqualitaet.hashes import digest, write_if_changed
+from luftqualitaet.output import output_path, prune_assets, publish_asset
+from luftqualitaet.statushistory import StatusRing, ring_path
+from luftqualitaet.summary import read_ai_summary
+from luftqualitaet.vendor import leaflet_assets
+from luftqualitaet.stores import get_city_registry, get_content_hashes, get_history, get_metrics, get_response_cache
+
+
+# Table of contents generation
+section_titles = [
+    "Luftqualitätsindex (AQI) in deutschen Städten",
+    "Feinstaub PM2.5 Konzentration",
+    "Feinstaub PM10 Konzentration",
+    "Stickstoffdioxid (NO2)",
+    "Ozon (O3)",
+    "Schwefeldioxid (SO2)",
+    "Kohlenmonoxid (CO)",
+    "Luftqualitätskomponenten Vergleich",
+    "Tage über WHO-Richtwerten",
+    "Verlauf des AQI über Zeit"
+]
+section_ids = [
+    "aqi-bar",
+    "pm25",
+    "pm10",
+    "no2",
+    "o3",
+    "so2",
+    "co",
+    "multi",
+    "exceedances",
+    "timeline"
+]
+
+
+# HTML-Blöcke in fester Reihenfolge (wie section_ids), unabhängig davon, welcher Chart zuerst fertig war
+def build_chart_sections(chart_urls):
+    iframe_blocks_with_ids = []
+    for key, title, sid in zip(chart_keys, section_titles, section_ids):
+        iframe_url = chart_urls.get(key)
+        if iframe_url is None:
+            continue
+        iframe_html = f"""
+        <section id="{sid}">
+            <h2>{title}</h2>
+            <iframe src="{iframe_url}" scrolling="no" frameborder="0" style="width: 100%; height: 500px;"></iframe>
+        </section>
+        """
+        iframe_blocks_with_ids.append(iframe_html)
+    return iframe_blocks_with_ids
+
+
+def build_contents_html():
+    # Table of contents HTML
+    contents_html = '<nav class="toc-nav">'
+    contents_html += '<h2 style="margin-top:0;color:#003366;">Inhalt</h2><ul style="list-style:none;padding-left:0;">'
+    for title, sid in [("Luftqualitätsindex (AQI) – Karte", "interactive-map")] + list(zip(section_titles, section_ids)):
+        contents_html += f'<li style="margin-bottom:8px;"><a href="#{sid}" style="color:#003366;text-decoration:underline;">{title}</a></li>'
+    contents_html += '</ul></nav>'
+    return contents_html
+
+
+def run_status_checks(chart_urls, timestamp):
+    # Status-Checks
+    status_checks = []
+    # API Ninjas: Ergebnis der letzten echten Abrufe aus dem Antwort-Cache statt einer zusätzlichen Probe
+    health = get_response_cache().health(get_city_registry().names())
+    cache_info = f"Cache: {health['hits']} Treffer, {health['misses']} Abrufe"
+    if health["ok"] > 0:
+        status_checks.append({"name": "API Ninjas", "status": "OK", "desc": f"Luftqualitätsdaten abrufbar ({health['ok']}/{health['ok'] + health['failed']} Städte, {cache_info})", "latency_ms": health["latency_ms"]})
+    elif health["failed"] > 0:
+        error = f"Statuscode: {health['last_status_code']}" if health["last_status_code"] else health["last_error"]
+        status_checks.append({"name": "API Ninjas", "status": "Fehler", "desc": f"{error} ({cache_info})", "latency_ms": None})
+    else:
+        status_checks.append({"name": "API Ninjas", "status": "Fehler", "desc": "Noch keine Abrufe", "latency_ms": None})
+    start = time.perf_counter()
+    try:
+        test_dw = client.get("datawrapper", "/v3/charts", headers=HEADERS_DW, timeout=client.TIMEOUTS["status"], retries=0)
+        latency_ms = (time.perf_counter() - start) * 1000
+        if test_dw.status_code in [200, 401]:
+            status_checks.append({"name": "Datawrapper API", "status": "OK", "desc": "Chart-API erreichbar", "latency_ms": latency_ms})
+        else:
+            status_checks.append({"name": "Datawrapper API", "status": "Fehler", "desc": f"Statuscode: {test_dw.status_code}", "latency_ms": latency_ms})
+    except Exception as e:
+        status_checks.append({"name": "Datawrapper API", "status": "Fehler", "desc": str(e), "latency_ms": None})
+    chart_status = "OK" if len(chart_urls) > 0 else "Fehler"
+    status_checks.append({"name": "Diagramme", "status": chart_status, "desc": "Diagramme erfolgreich generiert" if chart_status == "OK" else "Keine Diagramme generiert", "latency_ms": None})
+    record_status_checks(status_checks)
+    status_checks.append({"name": "Letztes Update", "status": timestamp, "desc": f"Zeitpunkt der letzten Aktualisierung: {timestamp}"})
+    return status_checks
+
+
+# Jeden Lauf im Ringpuffer des jeweiligen Checks festhalten
+def record_status_checks(status_checks):
+    for check in status_checks:
+        ring = StatusRing(ring_path(STATUS_HISTORY_DIR, check["name"]), STATUS_HISTORY_SIZE)
+        ok = check["status"] == "OK"
+        ring.append(ok, latency_ms=check.get("latency_ms"), error=None if ok else check["desc"])
+
+
+def status_rects(name):
+    records, uptime = StatusRing(ring_path(STATUS_HISTORY_DIR, name), STATUS_HISTORY_SIZE).recent(STATUS_BARS)
+    # Noch nicht belegte Plätze grau auffüllen, damit die Leiste immer gleich lang ist
+    rects = ['<span class="status-rect" style="background:#ddd;" title="Keine Daten"></span>'] * (STATUS_BARS - len(records))
+    for record in records:
+        when = datetime.fromtimestamp(record["at"]).strftime("%d.%m.%Y %H:%M")
+        if record["ok"]:
+            color = "#2ecc40"
+            info = "OK" if record["latency_ms"] is None else f"OK, {record['latency_ms']:.0f} ms"
+        else:
+            color = "#ff4136"
+            info = f"Fehler: {record['error']}" if record["error"] else "Fehler"
+        rects.append(f'<span class="status-rect" style="background:{color};" title="{html.escape(when + " – " + info)}"></span>')
+    return ''.join(rects), uptime
+
+
+def write_status_page(status_checks, assets):
+    hashes = get_content_hashes()
+    # Write status to JSON
+    write_if_changed(hashes, output_path("status.json"), json.dumps(status_checks, ensure_ascii=False, indent=2))
+
+    # Statusseite generieren
+    status_html_blocks = []
+    for check in status_checks:
+        if check["name"] == "Letztes Update":
+            bar = ""
+            uptime_html = ""
+        else:
+            # Balken aus dem tatsächlichen Verlauf, Tooltip mit Zeitpunkt und Latenz
+            rects, uptime = status_rects(check["name"])
+            bar = f'<div class="status-bar">{rects}</div>'
+            uptime_html = f'<span style="float:right;font-weight:400;color:#555;">{uptime:.1f} % verfügbar</span>' if uptime is not None else ""
+        status_html_blocks.append(f'''
+        <div class="status-item">
+            <div style="font-weight:600;font-size:1.1em;color:#003366;margin-bottom:4px;">{check['name']}{uptime_html}</div>
+            {bar}
+            <div style="font-size:0.95em;color:#555;margin-top:2px;">{html.escape(check['desc'])}</div>
+        </div>
+        ''')
+    status_html_blocks_str = ''.join(status_html_blocks)
+
+    status_page = f"""
+    <!DOCTYPE html>
+    <html lang=\"de\">
+    <head>
+        <meta charset=\"UTF-8\">
+        <title>Status – Luftqualitätsdaten</title>
+        <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">
+        <link rel=\"icon\" href=\"{assets['favicon.svg']}\" type=\"image/svg+xml\">
+        <link rel=\"stylesheet\" href=\"{assets['status.css']}\">
+    </head>
+    <body>
+        <div class=\"container\">
+            <h1>Status</h1>
+            <div class=\"status-list\">
+                {status_html_blocks_str}
+            </div>
+            <a href=\"index.html\" class=\"back-link\">Zurück zur Hauptseite</a>
+        </div>
+    </body>
+    </html>
+    """
+
+    write_if_changed(hashes, output_path("status.html"), status_page)
+
+
+# Statistik-Abschnitt: gleitende Mittel und Tage über den Grenzwerten je Stadt (siehe stats.py)
+def build_stats_html(stats):
+    if not stats:
+        return ""
+    from luftqualitaet.stats import LABELS
+
+    def cell(value):
+        return "–" if value is None else f"{value:.0f}"
+
+    columns = [("aqi", "1h"), ("aqi", "8h"), ("aqi", "24h"), ("pm25", "24h"), ("pm10", "24h"), ("no2", "24h"), ("o3", "8h")]
+    header = "".join(f"<th>{LABELS[p]} {w}</th>" for p, w in columns)
+    rows = ""
+    for city, entry in stats["cities"].items():
+        values = "".join(f"<td>{cell(entry['rolling'][p][w])}</td>" for p, w in columns)
+        who = sum(entry["exceedances"].get("WHO", {}).values())
+        eu = sum(entry["exceedances"].get("EU", {}).values())
+        rows += f"<tr><th scope=\"row\">{html.escape(city)}</th>{values}<td>{who}</td><td>{eu}</td></tr>"
+    limits = "; ".join(
+        f"{limit['source']} {LABELS[limit['pollutant']]} "
+        f"{ {'mean': 'Tagesmittel', 'max8h': '8h-Mittel', 'max1h': 'Stundenmittel'}[limit['metric']] } {limit['value']} µg/m³"
+        for limit in stats["limits"]
+    )
+    return f'''
+    <section id="statistik">
+        <h2>Statistik</h2>
+        <p>Gleitende Mittel bis {html.escape(stats["as_of"][:16].replace("T", " "))} und Tage mit Überschreitungen
+        seit {stats["first_day"]} ({stats["days"]} Tage Messhistorie).</p>
+        <div class="stats-scroll">
+            <table class="stats-table">
+                <thead><tr><th>Stadt</th>{header}<th>Überschreitungen WHO</th><th>Überschreitungen EU</th></tr></thead>
+                <tbody>{rows}</tbody>
+            </table>
+        </div>
+        <p class="stats-note">Überschreitungen zählen Tage je Schadstoff. Grenz- und Richtwerte: {html.escape(limits)}.</p>
+    </section>
+    '''
+
+
+def write_index_page(data_list, chart_urls, timestamp, assets, leaflet, ai_summary=None, series_url=None, stats=None,
+                     grid=None):
+    iframe_blocks_with_ids = build_chart_sections(chart_urls)
+    contents_html = build_contents_html()
+
+    # Interaktive Karte vorbereiten
+    map_markers = []
+    city_coords = get_city_registry().coords()
+    for entry in data_list:
+        city = entry["city"]
+        coords = city_coords.get(city)
+        if coords:
+            marker = {
+                "city": city,
+                "lat": coords[0],
+                "lng": coords[1],
+                "aqi": entry["aqi"],
+                "pm25": entry["pm25"],
+                "pm10": entry["pm10"],
+                "co": entry["co"],
+                "no2": entry["no2"],
+                "so2": entry["so2"],
+                "o3": entry["o3"]
+            }
+            map_markers.append(marker)
+    # Markerdaten als eigene, cachebare Datei; die Version im Query-String ändert sich nur mit dem Inhalt
+    map_markers_json = json.dumps(map_markers, ensure_ascii=False)
+    write_if_changed(get_content_hashes(), output_path("markers.json"), map_markers_json)
+    markers_url = f"markers.json?v={digest(map_markers_json)[:12]}"
+
+    # Optionales AQI-Raster (IDW) als Overlay: Bild-URL und Grenzen (Süd, West, Nord, Ost)
+    grid_attrs = ""
+    if grid:
+        bounds = ",".join(str(v) for corner in grid["bounds"] for v in corner)
+        grid_attrs = f'\n            data-grid="{grid["url"]}" data-grid-bounds="{bounds}"'
+
+    # Interaktive Leaflet-Karte HTML Block: Leaflet und Marker lädt site.js erst, wenn die Karte sichtbar wird
+    leaflet_map_html = f'''
+    <section id="interactive-map">
+        <h2>Interaktive Karte: Luftqualitätsindex (AQI)</h2>
+        <div id="leaflet-map" style="width:100%;height:500px;"
+            data-markers="{markers_url}"{grid_attrs}
+            data-leaflet-js="{leaflet['leaflet.js']['url']}" data-leaflet-js-integrity="{leaflet['leaflet.js']['integrity']}"
+            data-leaflet-css="{leaflet['leaflet.css']['url']}" data-leaflet-css-integrity="{leaflet['leaflet.css']['integrity']}"></div>
+    </section>
+    '''
+
+    # Verlauf nach Stadt aus den statischen Zeitreihen-Shards; site.js lädt Manifest und Shards bei Sichtbarkeit
+    series_html = ""
+    if series_url:
+        series_html = f'''
+    <section id="series">
+        <h2>Verlauf nach Stadt</h2>
+        <div id="series-explorer" data-manifest="{series_url}">
+            <div class="series-controls">
+                <label>Stadt <select name="city"></select></label>
+                <label>Messwert <select name="pollutant"></select></label>
+                <label>Auflösung <select name="resolution"></select></label>
+                <label>Von <input type="date" name="from"></label>
+                <label>Bis <input type="date" name="to"></label>
+            </div>
+            <svg class="series-chart" viewBox="0 0 800 300" preserveAspectRatio="none" role="img" aria-label="Verlauf"></svg>
+            <p class="series-info"></p>
+        </div>
+    </section>
+    '''
+
+    # HTML-Seite für die Luftqualitätsdaten
+    # AI Summary für Website laden (frisch aus diesem Lauf oder die zuletzt gespeicherte)
+    ai_summary_text = ai_summary if ai_summary is not None else read_ai_summary()
+
+    # AI Summary HTML Block
+    ai_summary_html = f'''
+    <aside class="ai-summary-block">
+        <h2>AI Zusammenfassung</h2>
+        <div class="ai-summary-text">{ai_summary_text}</div>
+    </aside>
+    '''
+
+    iframe_html_blocks = []
+    for block in iframe_blocks_with_ids:
+        block_fixed = re.sub(r'<iframe src="([^"]+)"', r'<iframe class="lazy-iframe" data-src="\1"', block)
+        iframe_html_blocks.append(block_fixed)
+    iframe_html_blocks_str = ''.join(iframe_html_blocks)
+    # Interaktive Karte als ersten Block nach Inhaltsverzeichnis
+    all_html_blocks_str = leaflet_map_html + build_stats_html(stats) + series_html + iframe_html_blocks_str
+    html_content = f"""
+    <!DOCTYPE html>
+    <html lang="de">
+    <head>
+        <meta charset="UTF-8">
+        <title>Luftqualität in deutschen Städten</title>
+        <meta name="description" content="Aktuelle Luftqualitätsdaten und Trends für deutsche Großstädte. Diagramme, Karten und Zeitverläufe.">
+        <meta name="keywords" content="Luftqualität, AQI, Deutschland, Städte, Feinstaub, NO2, Ozon, Datawrapper, Umwelt, Diagramm, Karte">
+        <meta name="author" content="Automatisch erzeugt mit Python und API Ninjas">
+        <meta property="og:title" content="Luftqualität in deutschen Städten">
+        <meta property="og:description" content="Vergleich und Verlauf der Luftqualität in deutschen Großstädten.">
+        <meta property="og:type" content="website">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <link rel="icon" href="{assets['favicon.svg']}" type="image/svg+xml">
+        <link rel="stylesheet" href="{assets['index.css']}">
+        <script src="{assets['site.js']}" defer></script>
+    </head>
+    <body>
+        <h1>Luftqualität in deutschen Großstädten (aktuell)</h1>
+        <p style="text-align:center;">Letztes Update: {timestamp}</p>
+        <a href="/status.html" class="status-link">Status &rarr;</a>
+        {contents_html}
+        <div class="main-content-wrapper">
+            <div class="main-content">
+                {all_html_blocks_str}
+            </div>
+            {ai_summary_html}
+        </div>
+        <footer>
+            <p>Quellen: <a href="https://api-ninjas.com/api/airquality" style="color:white;">API Ninjas</a> &amp; <a href="https://www.datawrapper.de/" style="color:white;">Datawrapper</a></p>
+            <p>&copy; 2025 Luftqualitätsdaten Deutschland</p>
+        </footer>
+    </body>
+    </html>
+    """
+    write_if_changed(get_content_hashes(), output_path("index.html"), html_content)
+
+    print("-------------Fertig-------------")
+    print("Website generated successfully!")
+
+
+# html seite schreiben
+def render_pages(data_list, chart_urls, timestamp, ai_summary=None, stats=None):
+    # CSS/JS/Favicon als Dateien mit Inhalts-Hash im Namen, damit Browser sie dauerhaft cachen können
+    hashes = get_content_hashes()
+    assets = {name: publish_asset(name) for name in ["index.css", "status.css", "site.js", "favicon.svg"]}
+    leaflet = leaflet_assets()
+    with get_metrics().stage("raster"):
+        # numpy erst hier laden
+        from luftqualitaet.grid import write_aqi_grid
+
+        grid = write_aqi_grid(data_list, get_city_registry().coords())
+    with get_metrics().stage("zeitreihen"):
+        from luftqualitaet.series import write_series
+
+        series_url = write_series(get_history())
+    status_checks = run_status_checks(chart_urls, timestamp)
+    write_status_page(status_checks, assets)
+    write_index_page(data_list, chart_urls, timestamp, assets, leaflet, ai_summary, series_url, stats, grid)
+    prune_assets(list(assets.values()) + [info["url"] for info in leaflet.values()] + ([grid["url"]] if grid else []))
+    hashes.save()
@@ -0,0 +1,172 @@
+import json
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from luftqualitaet.config import HISTORY_PATH, SERIES_RESOLUTIONS
+from luftqualitaet.hashes import digest
+from luftqualitaet.history import COLUMNS, HistoryStore
+from luftqualitaet.output import output_path, write_file
+
+
+# Vorberechnete Zeitreihen als statische JSON-Shards neben index.html:
+#   series/<stadt>/<messwert>/<auflösung>/<zeitraum>.json  +  series/manifest.json
+# Die Seite lädt nur die Shards für die gewählte Stadt und den gewählten Zeitraum.
+SERIES_DIR = "series"
+POLLUTANTS = COLUMNS[2:]
+LABELS = {"aqi": "AQI", "pm25": "PM2.5", "pm10": "PM10", "co": "CO", "no2": "NO₂", "so2": "SO₂", "o3": "O₃"}
+# Auflösung -> (Schrittweite in Sekunden, pandas-Frequenz, Zeitraum eines Shards)
+RESOLUTIONS = {
+    "hour": (3600, "h", "month"),
+    "day": (86400, "D", "year"),
+}
+UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+
+def slugify(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower().translate(UMLAUTS)).strip("-")
+
+
+# Zeitraum eines Shards als Zahl (202401 für Monate, 2024 für Jahre), damit pro Zeile kein strftime nötig ist
+def _period_key(year, month, period):
+    return year * 100 + month if period == "month" else year
+
+
+def manifest_path():
+    return output_path(os.path.join(SERIES_DIR, "manifest.json"))
+
+
+def _load_manifest():
+    try:
+        with open(manifest_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Zeitreihen-Manifest nicht lesbar, baue neu auf: {e}")
+        return None
+
+
+# Unveränderte Shards (abgeschlossene Zeiträume) nicht neu schreiben, damit ETag und Browser-Cache gültig bleiben
+def _write_shard(path, content):
+    data = content.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    write_file(path, data, fast=True)
+    return True
+
+
+# Dichtes Array ab dem ersten Wert mit fester Schrittweite; Lücken sind null
+def _shard(city, pollutant, resolution, step, timestamps, values):
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return None
+    seconds = timestamps[valid] // 10**9
+    start = int(seconds[0])
+    slots = (seconds - start) // step
+    dense = np.full(int(slots[-1]) + 1, np.nan)
+    dense[slots] = np.round(values[valid], 1)
+    header = json.dumps({"city": city, "pollutant": pollutant, "resolution": resolution, "start": start, "step": step},
+                        ensure_ascii=False, separators=(",", ":"))
+    # Nur Zahlen im Array, daher ist das Ersetzen von NaN durch null hier sicher
+    values = json.dumps(dense.tolist(), separators=(",", ":")).replace("NaN", "null")
+    return f'{header[:-1]},"values":{values}}}'
+
+
+def _write_year(rows, resolutions, touched, cities, stats):
+    for resolution in resolutions:
+        step, freq, period = RESOLUTIONS[resolution]
+        binned = (rows.assign(timestamp=rows["timestamp"].dt.floor(freq))
+                  .groupby(["city", "timestamp"], sort=True)[POLLUTANTS].mean()
+                  .reset_index())
+        binned["bucket"] = _period_key(binned["timestamp"].dt.year, binned["timestamp"].dt.month, period)
+        # Nur Zeiträume mit neu geschriebenen Messungen (touched: Monate als 202401); None = alle
+        if touched is not None:
+            binned = binned[binned["bucket"].isin({key if period == "month" else key // 100 for key in touched})]
+        for (city, key), group in binned.groupby(["city", "bucket"], sort=False):
+            bucket = f"{key // 100}-{key % 100:02d}" if period == "month" else str(key)
+            entry = cities.setdefault(city, {"slug": slugify(city), "buckets": {}})
+            buckets = entry["buckets"].setdefault(resolution, [])
+            if bucket not in buckets:
+                buckets.append(bucket)
+                buckets.sort()
+            timestamps = group["timestamp"].to_numpy(dtype="datetime64[ns]").astype("int64")
+            for pollutant in POLLUTANTS:
+                content = _shard(city, pollutant, resolution, step, timestamps, group[pollutant].to_numpy(dtype=float))
+                if content is None:
+                    continue
+                path = output_path(os.path.join(SERIES_DIR, entry["slug"], pollutant, resolution, f"{bucket}.json"))
+                if _write_shard(path, content):
+                    stats["written"] += 1
+                    stats["bytes"] += len(content)
+                else:
+                    stats["unchanged"] += 1
+
+
+# Schreibt die Shards der Zeiträume neu, in die seit dem letzten Lauf Messungen geschrieben wurden – auch
+# verspätet übernommene ältere (rebuild=True: die gesamte Historie). Das Manifest merkt sich dazu die
+# Commit-Nummer der Historie. Gelesen wird jahresweise, damit der Speicherbedarf begrenzt bleibt.
+# Gibt die URL des Manifests (mit Inhaltsversion) zurück oder None ohne Daten.
+def write_series(store, rebuild=False, resolutions=None):
+    resolutions = [r for r in (resolutions or SERIES_RESOLUTIONS) if r in RESOLUTIONS]
+    days = store.days()
+    if not days or not resolutions:
+        return None
+    manifest = None if rebuild else _load_manifest()
+    if manifest and (manifest.get("resolutions", {}).keys() != set(resolutions) or manifest.get("sequence") is None):
+        manifest = None
+    if manifest:
+        new, sequence = store.read_since(manifest["sequence"], columns=["timestamp"])
+        # Nichts Neues seit dem letzten Lauf: Manifest unverändert lassen
+        if sequence == manifest["sequence"]:
+            with open(manifest_path(), "r", encoding="utf-8") as f:
+                return f"{SERIES_DIR}/manifest.json?v={digest(f.read())[:12]}"
+        touched = set(new["timestamp"].dt.year * 100 + new["timestamp"].dt.month)
+        years = sorted({key // 100 for key in touched})
+    else:
+        # Nummer vor dem Lesen: spätere Commits werden beim nächsten Lauf (erneut) übernommen
+        sequence = store.sequence()
+        touched = None
+        years = range(int(days[0][:4]), int(days[-1][:4]) + 1)
+    cities = manifest["cities"] if manifest else {}
+    stats = {"written": 0, "unchanged": 0, "bytes": 0}
+    first = pd.Timestamp(manifest["start"]) if manifest and manifest.get("start") else None
+    end = pd.Timestamp(manifest["end"]) if manifest and manifest.get("end") else None
+
+    for year in years:
+        rows = store.read(start=f"{year}-01-01", end=f"{year}-12-31 23:59:59")
+        if rows.empty:
+            continue
+        _write_year(rows, resolutions, touched, cities, stats)
+        first = min(first, rows["timestamp"].min()) if first is not None else rows["timestamp"].min()
+        end = max(end, rows["timestamp"].max()) if end is not None else rows["timestamp"].max()
+
+    manifest = {
+        "start": first.isoformat() if first is not None else None,
+        "end": end.isoformat() if end is not None else None,
+        "sequence": sequence,
+        "pollutants": POLLUTANTS,
+        "labels": LABELS,
+        "resolutions": {r: {"step": RESOLUTIONS[r][0], "period": RESOLUTIONS[r][2]} for r in resolutions},
+        "cities": dict(sorted(cities.items())),
+    }
+    content = json.dumps(manifest, ensure_ascii=False, separators=(",", ":"))
+    _write_shard(manifest_path(), content)
+    print(f"🗂️ Zeitreihen-Shards: {stats['written']} geschrieben ({stats['bytes'] / 1024:.0f} KiB), "
+          f"{stats['unchanged']} unverändert")
+    return f"{SERIES_DIR}/manifest.json?v={digest(content)[:12]}"
+
+
+if __name__ == "__main__":
+    # python -m luftqualitaet.series rebuild [historie]
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Verwendung: python -m luftqualitaet.series rebuild [data/history]")
+        sys.exit(1)
+    write_series(HistoryStore(sys.argv[2] if len(sys.argv) > 2 else HISTORY_PATH), rebuild=True)
@@ -0,0 +1,195 @@
+// Lazy loading for iframes, the map and the series explorer
+document.addEventListener('DOMContentLoaded', function() {
+    const targets = document.querySelectorAll('iframe[data-src], #leaflet-map[data-markers], #series-explorer[data-manifest]');
+    const observer = new IntersectionObserver((entries, obs) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                const target = entry.target;
+                if (target.tagName === 'IFRAME') {
+                    target.src = target.dataset.src;
+                    target.classList.add('loaded');
+                } else if (target.id === 'series-explorer') {
+                    loadSeries(target);
+                } else {
+                    loadMap(target);
+                }
+                obs.unobserve(target);
+            }
+        });
+    }, { rootMargin: '100px' });
+    targets.forEach(target => {
+        observer.observe(target);
+    });
+});
+
+function loadScript(src, integrity) {
+    return new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        if (integrity) {
+            script.integrity = integrity;
+            script.crossOrigin = '';
+        }
+        script.onload = resolve;
+        script.onerror = reject;
+        document.head.appendChild(script);
+    });
+}
+
+function loadStyle(href, integrity) {
+    const link = document.createElement('link');
+    link.rel = 'stylesheet';
+    link.href = href;
+    if (integrity) {
+        link.integrity = integrity;
+        link.crossOrigin = '';
+    }
+    document.head.appendChild(link);
+}
+
+// Interaktive Karte: Leaflet und markers.json werden erst geladen, wenn die Karte sichtbar wird
+function loadMap(element) {
+    loadStyle(element.dataset.leafletCss, element.dataset.leafletCssIntegrity);
+    Promise.all([
+        typeof L === 'undefined' ? loadScript(element.dataset.leafletJs, element.dataset.leafletJsIntegrity) : Promise.resolve(),
+        fetch(element.dataset.markers).then(response => response.json())
+    ]).then(([, markers]) => {
+        const map = L.map(element).setView([51.1634, 10.4477], 6);
+        L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+            maxZoom: 18,
+            attribution: '© OpenStreetMap'
+        }).addTo(map);
+        // AQI-Fläche aus der Inverse-Distanz-Interpolation, abschaltbar über die Ebenenauswahl
+        if (element.dataset.grid) {
+            const [south, west, north, east] = element.dataset.gridBounds.split(',').map(Number);
+            const grid = L.imageOverlay(element.dataset.grid, [[south, west], [north, east]], {
+                opacity: 0.8,
+                attribution: 'AQI-Fläche: Interpolation (IDW)'
+            }).addTo(map);
+            L.control.layers(null, { 'AQI-Fläche (interpoliert)': grid }).addTo(map);
+        }
+        markers.forEach(m => {
+            let color = m.aqi < 50 ? 'green' : m.aqi < 100 ? 'orange' : 'red';
+            let marker = L.circleMarker([m.lat, m.lng], {
+                radius: 12,
+                color: color,
+                fillColor: color,
+                fillOpacity: 0.7
+            }).addTo(map);
+            marker.bindPopup(`<b>${m.city}</b><br>AQI: ${m.aqi}<br>PM2.5: ${m.pm25}<br>PM10: ${m.pm10}<br>CO: ${m.co}<br>NO₂: ${m.no2}<br>SO₂: ${m.so2}<br>O₃: ${m.o3}`);
+        });
+    }).catch(error => {
+        console.error(error);
+        element.textContent = 'Karte konnte nicht geladen werden.';
+    });
+}
+
+// Verlauf nach Stadt: Manifest laden, dann nur die Shards (Monat bzw. Jahr) für Stadt und Zeitraum holen
+function loadSeries(element) {
+    const base = element.dataset.manifest.replace(/manifest\.json.*$/, '');
+    const form = {};
+    element.querySelectorAll('select, input').forEach(input => { form[input.name] = input; });
+    const shards = new Map();
+
+    const fetchShard = url => {
+        if (!shards.has(url)) {
+            shards.set(url, fetch(url).then(response => response.ok ? response.json() : null).catch(() => null));
+        }
+        return shards.get(url);
+    };
+
+    fetch(element.dataset.manifest).then(response => response.json()).then(manifest => {
+        fillSelect(form.city, Object.keys(manifest.cities).map(city => [city, city]));
+        fillSelect(form.pollutant, manifest.pollutants.map(p => [p, manifest.labels[p] || p]));
+        fillSelect(form.resolution, Object.keys(manifest.resolutions).map(r => [r, r === 'hour' ? 'Stunde' : r === 'day' ? 'Tag' : r]));
+        const end = manifest.end.slice(0, 10);
+        form.to.value = end;
+        form.from.value = shiftDate(end, -7);
+        form.from.min = form.to.min = manifest.start.slice(0, 10);
+        form.from.max = form.to.max = end;
+
+        const update = () => {
+            const city = manifest.cities[form.city.value];
+            const resolution = form.resolution.value;
+            const period = manifest.resolutions[resolution].period;
+            const available = new Set(city.buckets[resolution] || []);
+            const urls = periodKeys(form.from.value, form.to.value, period)
+                .filter(key => available.has(key))
+                .map(key => `${base}${city.slug}/${form.pollutant.value}/${resolution}/${key}.json`);
+            Promise.all(urls.map(fetchShard)).then(results => {
+                const from = Date.parse(form.from.value + 'T00:00:00Z') / 1000;
+                const to = Date.parse(form.to.value + 'T00:00:00Z') / 1000 + 86400;
+                const points = [];
+                results.filter(Boolean).forEach(shard => {
+                    shard.values.forEach((value, i) => {
+                        const t = shard.start + i * shard.step;
+                        if (t >= from && t < to) points.push([t, value]);
+                    });
+                });
+                drawSeries(element.querySelector('.series-chart'), points, from, to);
+                const values = points.filter(p => p[1] !== null).map(p => p[1]);
+                element.querySelector('.series-info').textContent = values.length
+                    ? `${values.length} Werte, Minimum ${Math.min(...values)}, Maximum ${Math.max(...values)}`
+                    : 'Keine Daten im gewählten Zeitraum.';
+            });
+        };
+        Object.values(form).forEach(input => input.addEventListener('change', update));
+        update();
+    }).catch(error => {
+        console.error(error);
+        element.textContent = 'Verlauf konnte nicht geladen werden.';
+    });
+}
+
+function fillSelect(select, options) {
+    options.forEach(([value, label]) => select.add(new Option(label, value)));
+}
+
+function shiftDate(day, days) {
+    const date = new Date(day + 'T00:00:00Z');
+    date.setUTCDate(date.getUTCDate() + days);
+    return date.toISOString().slice(0, 10);
+}
+
+// Shard-Schlüssel zwischen zwei Tagen: YYYY-MM (Monat) oder YYYY (Jahr)
+function periodKeys(from, to, period) {
+    const keys = [];
+    let year = +from.slice(0, 4), month = +from.slice(5, 7);
+    const endYear = +to.slice(0, 4), endMonth = +to.slice(5, 7);
+    while (year < endYear || (year === endYear && (period === 'year' || month <= endMonth))) {
+        if (period === 'year') {
+            keys.push(String(year));
+            year += 1;
+        } else {
+            keys.push(`${year}-${String(month).padStart(2, '0')}`);
+            month = month === 12 ? 1 : month + 1;
+            if (month === 1) year += 1;
+        }
+    }
+    return keys;
+}
+
+// Einfacher Linienzug als SVG; Lücken (null) unterbrechen die Linie
+function drawSeries(svg, points, from, to) {
+    const width = 800, height = 300, pad = 30;
+    const values = points.filter(p => p[1] !== null).map(p => p[1]);
+    const max = values.length ? Math.max(...values) : 1;
+    const x = t => pad + (t - from) / (to - from) * (width - 2 * pad);
+    const y = v => height - pad - v / (max || 1) * (height - 2 * pad);
+    let path = '', pen = false;
+    points.forEach(([t, v]) => {
+        if (v === null) {
+            pen = false;
+            return;
+        }
+        path += `${pen ? 'L' : 'M'}${x(t).toFixed(1)},${y(v).toFixed(1)}`;
+        pen = true;
+    });
+    const label = t => new Date(t * 1000).toISOString().slice(0, 10);
+    svg.innerHTML = `
+        <line x1="${pad}" y1="${height - pad}" x2="${width - pad}" y2="${height - pad}" class="axis"/>
+        <text x="${pad}" y="${height - 8}">${label(from)}</text>
+        <text x="${width - pad}" y="${height - 8}" text-anchor="end">${label(to - 86400)}</text>
+        <text x="${pad}" y="${pad - 10}">${max}</text>
+        <path d="${path}" class="line"/>`;
+}
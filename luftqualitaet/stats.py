@@ -0,0 +1,237 @@
+import json
+import os
+import sys
+
+import pandas as pd
+
+from luftqualitaet.config import HISTORY_PATH, STATS_STATE_PATH
+from luftqualitaet.history import COLUMNS, HistoryStore
+from luftqualitaet.output import temp_name
+
+
+POLLUTANTS = COLUMNS[2:]
+LABELS = {"aqi": "AQI", "pm25": "PM2.5", "pm10": "PM10", "co": "CO", "no2": "NO₂", "so2": "SO₂", "o3": "O₃"}
+# Gleitende Mittel bis zum letzten Messzeitpunkt
+WINDOWS = {"1h": pd.Timedelta(hours=1), "8h": pd.Timedelta(hours=8), "24h": pd.Timedelta(hours=24)}
+# Vorlauf vor dem ersten neu berechneten Tag, damit das 8h-Mittel um Mitternacht vollständig ist
+LOOKBACK = pd.Timedelta(hours=7)
+
+# Grenz- und Richtwerte in µg/m³ (Quelle, Schadstoff, Tageskennzahl, Wert). Gezählt werden Tage:
+#   mean  = Tagesmittel, max8h = höchstes gleitendes 8h-Mittel, max1h = höchstes Stundenmittel
+# WHO: Luftqualitätsleitlinien 2021 (24h- bzw. 8h-Werte), EU: Richtlinie 2008/50/EG
+LIMITS = [
+    ("WHO", "pm25", "mean", 15),
+    ("WHO", "pm10", "mean", 45),
+    ("WHO", "no2", "mean", 25),
+    ("WHO", "so2", "mean", 40),
+    ("WHO", "o3", "max8h", 100),
+    ("WHO", "co", "mean", 4000),
+    ("EU", "pm10", "mean", 50),
+    ("EU", "no2", "max1h", 200),
+    ("EU", "so2", "max1h", 350),
+    ("EU", "so2", "mean", 125),
+    ("EU", "o3", "max8h", 120),
+    ("EU", "co", "max8h", 10000),
+]
+
+
+# Breite Tabelle (Tag x Stadt) in eine Spalte mit Index (date, city); ravel() ist zeilenweise wie from_product
+def _long(wide, name):
+    index = pd.MultiIndex.from_product([wide.index, wide.columns], names=["date", "city"])
+    return pd.Series(wide.to_numpy().ravel(), index=index, name=name)
+
+
+# Tageskennzahlen je Stadt und Schadstoff, vollständig vektorisiert:
+# Mittel, Median, 95. Perzentil und Maximum der Messwerte sowie höchstes 1h- und 8h-Mittel.
+# Stunden ohne Messung bleiben im Stundenraster leer; das 8h-Mittel braucht mindestens 6 Stunden (75 %).
+def daily_stats(rows):
+    days = rows["timestamp"].dt.floor("D").rename("date")
+    grouped = rows.groupby([days, "city"])[POLLUTANTS]
+    parts = []
+    for stat, frame in [("mean", grouped.mean()), ("p50", grouped.quantile(0.5)),
+                        ("p95", grouped.quantile(0.95)), ("max", grouped.max())]:
+        parts.append(frame.rename(columns=lambda p, stat=stat: f"{p}_{stat}"))
+
+    hours = rows["timestamp"].dt.floor("h")
+    hourly = rows.groupby([hours, "city"])[POLLUTANTS].mean()
+    grid = pd.date_range(hours.min(), hours.max(), freq="h")
+    cities = sorted(rows["city"].unique())
+    day_of_hour = grid.floor("D")
+    columns = []
+    for pollutant in POLLUTANTS:
+        wide = hourly[pollutant].unstack("city").reindex(index=grid, columns=cities)
+        columns.append(_long(wide.groupby(day_of_hour).max(), f"{pollutant}_max1h"))
+        columns.append(_long(wide.rolling(8, min_periods=6).mean().groupby(day_of_hour).max(), f"{pollutant}_max8h"))
+        if pollutant == "aqi":
+            columns.append(_long(wide.notna().groupby(day_of_hour).sum(), "hours"))
+    daily = pd.concat(parts, axis=1).join(pd.concat(columns, axis=1), how="left")
+    daily.index = daily.index.set_names(["date", "city"])
+    return daily.sort_index()
+
+
+# Zusammenhängende Tage zu Bereichen (erster, letzter Tag) von höchstens `max_days` Tagen
+def _day_ranges(days, max_days=31):
+    ranges = []
+    for day in days:
+        if ranges and day - ranges[-1][1] == pd.Timedelta(days=1) and day - ranges[-1][0] < pd.Timedelta(days=max_days):
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return ranges
+
+
+# Tageskennzahlen der gesamten Historie mit Wasserstand (neuester Messzeitpunkt) und Commit-Nummer;
+# jeder Lauf berechnet nur die Tage neu, die seit dem letzten Lauf geschriebene Messungen berühren
+# (wie TimelineState für den AQI-Verlauf)
+class StatsState:
+    def __init__(self, path="data/stats/daily.parquet"):
+        self.path = path
+        self.meta_path = f"{path}.json"
+        self.daily = None
+        self.watermark = None
+        self.sequence = None
+
+    def load(self):
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.daily = pd.read_parquet(self.path)
+            self.watermark = pd.Timestamp(meta["watermark"]) if meta.get("watermark") else None
+            self.sequence = meta.get("sequence")
+            return True
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(self.meta_path) or os.path.exists(self.path):
+                print(f"⚠️ Statistik-Zustand {self.path} nicht lesbar: {e}")
+            self.daily = None
+            self.watermark = None
+            self.sequence = None
+            return False
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = temp_name(self.path)
+        self.daily.to_parquet(tmp_path)
+        os.replace(tmp_path, self.path)
+        tmp_meta = temp_name(self.meta_path)
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({"watermark": self.watermark.isoformat() if self.watermark is not None else None,
+                       "sequence": self.sequence}, f)
+        os.replace(tmp_meta, self.meta_path)
+
+    def _compute(self, store, first_day, end=None):
+        rows = store.read(start=first_day - LOOKBACK, end=end)
+        if rows.empty:
+            return None, None
+        daily = daily_stats(rows)
+        return daily[daily.index.get_level_values("date") >= first_day], rows["timestamp"].max()
+
+    # Neuaufbau monatsweise, damit auch eine lange Historie nicht auf einmal im Speicher liegt
+    def rebuild(self, store):
+        parts = []
+        self.watermark = None
+        # Nummer vor dem Lesen: spätere Commits werden beim nächsten Lauf (erneut) übernommen
+        self.sequence = store.sequence()
+        months = sorted({day[:7] for day in store.days()})
+        for month in months:
+            start = pd.Timestamp(f"{month}-01")
+            end = start + pd.offsets.MonthBegin(1) - pd.Timedelta(seconds=1)
+            daily, latest = self._compute(store, start, end)
+            if daily is not None:
+                parts.append(daily)
+                self.watermark = latest
+        if not parts:
+            return None
+        self.daily = pd.concat(parts)
+        self.save()
+        print(f"♻️ Statistik neu aufgebaut ({len(self.daily)} Tageswerte)")
+        return self.daily
+
+    def update(self, store):
+        if self.daily is None and not self.load():
+            return self.rebuild(store)
+        if self.watermark is None or self.sequence is None:
+            return self.rebuild(store)
+        rows, sequence = store.read_since(self.sequence, columns=["timestamp"])
+        if sequence == self.sequence:
+            return self.daily
+        self.sequence = sequence
+        # Betroffen sind die Tage der neuen Messungen und, wegen des 8h-Mittels, der jeweils folgende Tag
+        stamps = rows["timestamp"]
+        days = sorted(set(stamps.dt.floor("D")) | set((stamps + LOOKBACK).dt.floor("D")))
+        for first_day, last_day in _day_ranges(days):
+            daily, latest = self._compute(store, first_day, last_day + pd.Timedelta(days=1) - pd.Timedelta(seconds=1))
+            dates = self.daily.index.get_level_values("date")
+            self.daily = pd.concat([self.daily[(dates < first_day) | (dates > last_day)], daily]).sort_index()
+            if latest is not None:
+                self.watermark = max(self.watermark, latest)
+        self.save()
+        return self.daily
+
+
+# Gleitende Mittel (1h/8h/24h) je Stadt bis zum letzten Messzeitpunkt der Historie
+def rolling_means(store, as_of):
+    rows = store.read(start=as_of - WINDOWS["24h"])
+    result = {}
+    for window, length in WINDOWS.items():
+        recent = rows[rows["timestamp"] > as_of - length]
+        result[window] = recent.groupby("city")[POLLUTANTS].mean()
+    return result
+
+
+# Tage über den Grenzwerten je Stadt: {Quelle: DataFrame Stadt x Schadstoff}
+def exceedances(daily):
+    counts = {}
+    cities = daily.index.get_level_values("city")
+    for source, pollutant, metric, value in LIMITS:
+        over = (daily[f"{pollutant}_{metric}"] > value).groupby(cities).sum()
+        counts.setdefault(source, {})[f"{pollutant}_{metric}"] = over
+    return {source: pd.DataFrame(columns) for source, columns in counts.items()}
+
+
+def _round(value, digits=1):
+    return None if value is None or pd.isna(value) else round(float(value), digits)
+
+
+# Zusammenfassung für Charts, AI-Prompt und die Statistik auf index.html (nur einfache Typen)
+def summarize(daily, store, as_of):
+    if daily is None or daily.empty or as_of is None:
+        return None
+    means = rolling_means(store, as_of)
+    counts = exceedances(daily)
+    today = daily[daily.index.get_level_values("date") == as_of.floor("D")].droplevel("date")
+    dates = daily.index.get_level_values("date")
+    cities = {}
+    for city in sorted(daily.index.get_level_values("city").unique()):
+        entry = {"rolling": {}, "today": {}, "exceedances": {}}
+        for pollutant in POLLUTANTS:
+            entry["rolling"][pollutant] = {
+                window: _round(frame.at[city, pollutant]) if city in frame.index else None
+                for window, frame in means.items()
+            }
+            if city in today.index:
+                entry["today"][pollutant] = {stat: _round(today.at[city, f"{pollutant}_{stat}"]) for stat in ["p50", "p95", "max"]}
+        for source, frame in counts.items():
+            entry["exceedances"][source] = {key: int(frame.at[city, key]) for key in frame.columns}
+        cities[city] = entry
+    return {
+        "as_of": as_of.isoformat(),
+        "first_day": dates.min().strftime("%Y-%m-%d"),
+        "days": int(dates.nunique()),
+        "limits": [{"source": s, "pollutant": p, "metric": m, "value": v, "key": f"{p}_{m}"} for s, p, m, v in LIMITS],
+        "cities": cities,
+    }
+
+
+def compute_stats(state, store):
+    daily = state.update(store)
+    return summarize(daily, store, state.watermark)
+
+
+if __name__ == "__main__":
+    # python -m luftqualitaet.stats rebuild [historie] [zustand]
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Verwendung: python -m luftqualitaet.stats rebuild [data/history] [data/stats/daily.parquet]")
+        sys.exit(1)
+    root = sys.argv[2] if len(sys.argv) > 2 else HISTORY_PATH
+    path = sys.argv[3] if len(sys.argv) > 3 else STATS_STATE_PATH
+    StatsState(path).rebuild(HistoryStore(root))
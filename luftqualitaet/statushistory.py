@@ -0,0 +1,83 @@
+import fcntl
+import os
+import re
+import struct
+import time
+
+
+# Ringpuffer fester Größe auf der Platte für die Ergebnisse eines Status-Checks.
+# Kopf: Magic, Kapazität, nächster Slot, Anzahl, Anzahl OK im Fenster.
+# Datensatz: Zeitpunkt, Latenz in ms, OK-Flag, Fehlermeldung (gekürzt).
+# Anhängen und Lesen der letzten n Einträge sind O(1) bzw. O(n) – unabhängig von der Historienlänge.
+MAGIC = b"LQRB"
+HEADER = struct.Struct("<4sIIII")
+RECORD = struct.Struct("<dfB51s")
+
+
+class StatusRing:
+    def __init__(self, path, capacity=1000):
+        self.path = path
+        self.capacity = capacity
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        f = open(self.path, "r+b" if os.path.exists(self.path) else "w+b")
+        fcntl.flock(f, fcntl.LOCK_EX)
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:4] != MAGIC:
+            # Neue (oder unbrauchbare) Datei: Kopf schreiben und alle Slots vorbelegen
+            f.seek(0)
+            f.truncate()
+            f.write(HEADER.pack(MAGIC, self.capacity, 0, 0, 0))
+            f.write(b"\0" * RECORD.size * self.capacity)
+            f.flush()
+            return f, (self.capacity, 0, 0, 0)
+        return f, HEADER.unpack(header)[1:]
+
+    def append(self, ok, latency_ms=None, error=None, at=None):
+        f, (capacity, head, count, ok_count) = self._open()
+        try:
+            slot_offset = HEADER.size + head * RECORD.size
+            if count == capacity:
+                # Der älteste Eintrag wird überschrieben: sein OK-Flag aus der Zählung nehmen
+                f.seek(slot_offset)
+                old = RECORD.unpack(f.read(RECORD.size))
+                ok_count -= old[2]
+            else:
+                count += 1
+            f.seek(slot_offset)
+            latency = float(latency_ms) if latency_ms is not None else -1.0
+            f.write(RECORD.pack(at or time.time(), latency, 1 if ok else 0, (error or "").encode("utf-8")[:51]))
+            ok_count += 1 if ok else 0
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, capacity, (head + 1) % capacity, count, ok_count))
+            f.flush()
+        finally:
+            f.close()
+
+    # Letzte n Einträge, älteste zuerst, plus Verfügbarkeit über das ganze Fenster
+    def recent(self, n):
+        if not os.path.exists(self.path):
+            return [], None
+        f, (capacity, head, count, ok_count) = self._open()
+        try:
+            n = min(n, count)
+            records = []
+            for i in range(n, 0, -1):
+                f.seek(HEADER.size + ((head - i) % capacity) * RECORD.size)
+                at, latency, ok, error = RECORD.unpack(f.read(RECORD.size))
+                records.append({
+                    "at": at,
+                    "ok": bool(ok),
+                    "latency_ms": latency if latency >= 0 else None,
+                    "error": error.rstrip(b"\0").decode("utf-8", "ignore"),
+                })
+        finally:
+            f.close()
+        uptime = ok_count / count * 100 if count else None
+        return records, uptime
+
+
+def ring_path(directory, name):
+    slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+    return os.path.join(directory, f"{slug}.ring")
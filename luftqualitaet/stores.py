@@ -0,0 +1,138 @@
+import threading
+
+from luftqualitaet.config import (
+    AI_SUMMARY_CACHE_PATH,
+    AI_SUMMARY_CACHE_TTL,
+    CHART_REGISTRY_PATH,
+    CITIES_OVERRIDE,
+    CITIES_PATH,
+    CITY_MAX_PRIORITY,
+    CONTENT_HASHES_PATH,
+    HISTORY_PATH,
+    NINJA_BREAKER_COOLDOWN,
+    NINJA_BREAKER_THRESHOLD,
+    NINJA_BURST,
+    NINJA_CACHE_MAX_ENTRIES,
+    NINJA_CACHE_PATH,
+    NINJA_CACHE_TTL,
+    NINJA_DAILY_QUOTA,
+    NINJA_GUARD_PATH,
+    NINJA_RATE_PER_SEC,
+    STATS_STATE_PATH,
+    TIMELINE_STATE_PATH,
+)
+
+
+# Zustandsbehaftete Speicher werden erst beim ersten Zugriff angelegt; pandas/pyarrow werden
+# dadurch nur geladen, wenn ein Lauf sie tatsächlich braucht.
+_stores = {}
+_lock = threading.Lock()
+
+
+def get_history():
+    with _lock:
+        if "history" not in _stores:
+            from luftqualitaet.history import HistoryStore
+
+            _stores["history"] = HistoryStore(HISTORY_PATH)
+        return _stores["history"]
+
+
+# Vorpivotierte AQI-Zeitreihe, wird pro Lauf nur um neue Messungen ergänzt
+def get_timeline_state():
+    with _lock:
+        if "timeline" not in _stores:
+            from luftqualitaet.timeline import TimelineState
+
+            _stores["timeline"] = TimelineState(TIMELINE_STATE_PATH)
+        return _stores["timeline"]
+
+
+# Tageskennzahlen (Mittel, Perzentile, 8h-Maxima) der gesamten Historie, inkrementell fortgeschrieben
+def get_stats_state():
+    with _lock:
+        if "stats" not in _stores:
+            from luftqualitaet.stats import StatsState
+
+            _stores["stats"] = StatsState(STATS_STATE_PATH)
+        return _stores["stats"]
+
+
+# Chart-Registry: bestehende Charts werden aktualisiert statt bei jedem Lauf neu angelegt
+def get_chart_registry():
+    with _lock:
+        if "charts" not in _stores:
+            from luftqualitaet.registry import ChartRegistry
+
+            _stores["charts"] = ChartRegistry(CHART_REGISTRY_PATH)
+        return _stores["charts"]
+
+
+# Prüfsummen für das Überspringen unveränderter Charts und Dateien
+def get_content_hashes():
+    with _lock:
+        if "hashes" not in _stores:
+            from luftqualitaet.hashes import ContentHashes
+
+            _stores["hashes"] = ContentHashes(CONTENT_HASHES_PATH)
+        return _stores["hashes"]
+
+
+# Antwort-Cache für API Ninjas, gemeinsam genutzt von Abruf und Statusseite
+def get_response_cache():
+    with _lock:
+        if "ninjas" not in _stores:
+            from luftqualitaet.cache import ResponseCache
+
+            _stores["ninjas"] = ResponseCache(NINJA_CACHE_PATH, NINJA_CACHE_TTL, NINJA_CACHE_MAX_ENTRIES)
+        return _stores["ninjas"]
+
+
+# AI-Zusammenfassungen, Schlüssel ist der Hash von Modell und Prompt
+def get_summary_cache():
+    with _lock:
+        if "summary" not in _stores:
+            from luftqualitaet.cache import ResponseCache
+
+            _stores["summary"] = ResponseCache(AI_SUMMARY_CACHE_PATH, AI_SUMMARY_CACHE_TTL, 100)
+        return _stores["summary"]
+
+
+# Quote, adaptive Rate und Circuit Breaker für API Ninjas
+def get_ninja_guard():
+    with _lock:
+        if "guard" not in _stores:
+            from luftqualitaet.quota import ApiGuard
+
+            _stores["guard"] = ApiGuard(
+                NINJA_GUARD_PATH,
+                NINJA_RATE_PER_SEC,
+                NINJA_BURST,
+                daily_quota=NINJA_DAILY_QUOTA,
+                failure_threshold=NINJA_BREAKER_THRESHOLD,
+                cooldown=NINJA_BREAKER_COOLDOWN,
+            )
+        return _stores["guard"]
+
+
+# Städte-Registry aus cities.csv (oder der Liste in CITIES)
+def get_city_registry():
+    with _lock:
+        if "cities" not in _stores:
+            from luftqualitaet.cityregistry import CityRegistry
+
+            if CITIES_OVERRIDE:
+                _stores["cities"] = CityRegistry.from_names(CITIES_OVERRIDE)
+            else:
+                _stores["cities"] = CityRegistry.from_csv(CITIES_PATH, CITY_MAX_PRIORITY)
+        return _stores["cities"]
+
+
+# Laufzeit- und Anfrage-Metriken des Prozesses
+def get_metrics():
+    with _lock:
+        if "metrics" not in _stores:
+            from luftqualitaet.metrics import Metrics
+
+            _stores["metrics"] = Metrics()
+        return _stores["metrics"]
@@ -0,0 +1,162 @@
+import json
+import threading
+import time
+
+from luftqualitaet import client
+from luftqualitaet.config import AI_SUMMARY_DEADLINE, OPENROUTER_API_KEY
+from luftqualitaet.hashes import digest
+from luftqualitaet.output import output_path, write_atomic
+from luftqualitaet.stores import get_summary_cache
+
+
+# Eine einzige Anfrage ohne Wiederholung: Verbindungsaufbau und Antwort zusammen bleiben im Budget (Sekunden)
+def get_ai_answer(model, content, budget=AI_SUMMARY_DEADLINE):
+    connect = min(client.TIMEOUTS["openrouter"][0], budget / 4)
+    response = client.post(
+        "openrouter",
+        "/api/v1/chat/completions",
+        headers={
+            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        },
+        data=json.dumps({
+            "model": model, # Optional
+            "messages": [
+            {
+                "role": "user",
+                "content": content
+            }
+            ]
+        }),
+        timeout=(connect, budget - connect),
+        retries=0,
+    )
+    return response
+
+
+SUMMARY_MODEL = "google/gemini-2.0-flash-exp:free"
+SUMMARY_FILE = "ai_summary.txt"
+SUMMARY_ERROR = "(Fehler beim Generieren der Zusammenfassung)"
+
+
+def build_prompt(data_list, stats=None):
+    # Prompt für die Zusammenfassung
+    cities_str = ", ".join([entry["city"] for entry in data_list])
+    avg_aqi = sum([entry["aqi"] for entry in data_list]) / len(data_list)
+    prompt = f"Fasse die Luftqualitätsdaten für folgende deutsche Großstädte zusammen: {cities_str}. Der durchschnittliche AQI beträgt {avg_aqi:.1f}."
+    if stats:
+        prompt += " " + stats_prompt(stats)
+    return prompt + " Erwähne Besonderheiten, Trends und gib einen kurzen Ausblick."
+
+
+# Kennzahlen aus der Historie, auf ganze Zahlen gerundet, damit kleine Schwankungen den Cache nicht umgehen
+def stats_prompt(stats, top=5):
+    from luftqualitaet.stats import LABELS
+
+    cities = stats["cities"]
+    aqi_24h = [(city, entry["rolling"]["aqi"]["24h"]) for city, entry in cities.items()
+               if entry["rolling"]["aqi"]["24h"] is not None]
+    text = ""
+    if aqi_24h:
+        aqi_24h.sort(key=lambda item: item[1], reverse=True)
+        text += "24-Stunden-Mittel des AQI (höchste zuerst): " + ", ".join(f"{city} {value:.0f}" for city, value in aqi_24h[:top]) + ". "
+    who = []
+    for city, entry in cities.items():
+        counts = {key: n for key, n in entry["exceedances"].get("WHO", {}).items() if n}
+        if counts:
+            details = ", ".join(f"{LABELS[key.split('_')[0]]} {n}" for key, n in sorted(counts.items(), key=lambda item: -item[1]))
+            who.append((sum(counts.values()), f"{city} ({details})"))
+    if who:
+        who.sort(reverse=True)
+        text += (f"Tage über WHO-Richtwerten seit {stats['first_day']} ({stats['days']} Tage Messhistorie): "
+                 + "; ".join(item for _, item in who[:top]) + ".")
+    else:
+        text += f"In {stats['days']} Tagen Messhistorie wurden keine WHO-Richtwerte überschritten."
+    return text.strip()
+
+
+def read_ai_summary():
+    try:
+        with open(output_path(SUMMARY_FILE), "r", encoding="utf-8") as f:
+            return f.read()
+    except Exception:
+        return "(Keine Zusammenfassung verfügbar)"
+
+
+def _write_summary(text):
+    write_atomic(output_path(SUMMARY_FILE), text.encode("utf-8"))
+
+
+# Liefert den Text der Zusammenfassung; `deadline` ist der späteste Zeitpunkt (time.monotonic) für die Antwort
+def generate_ai_summary(data_list, stats=None, deadline=None):
+    if len(data_list) == 0:
+        return None
+    deadline = deadline if deadline is not None else time.monotonic() + AI_SUMMARY_DEADLINE
+    prompt = build_prompt(data_list, stats)
+    # Gleiche Eingaben (Städte + gemittelte Werte stecken im Prompt) rufen das Modell nie zweimal auf
+    cache = get_summary_cache()
+    key = digest(SUMMARY_MODEL, prompt)
+    cached = cache.get(key)
+    if cached is not None:
+        print("🤖 AI-Zusammenfassung aus dem Cache (unveränderte Eingaben)")
+        return cached["text"]
+
+    start = time.perf_counter()
+    try:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Frist bereits abgelaufen")
+        ai_resp = get_ai_answer(SUMMARY_MODEL, prompt, remaining)
+        resp_json = ai_resp.json()
+        if "choices" in resp_json and resp_json["choices"]:
+            ai_text = resp_json["choices"][0]["message"]["content"]
+            cache.put(key, {"text": ai_text}, (time.perf_counter() - start) * 1000)
+            cache.save()
+        else:
+            print("OpenRouter Fehler/Antwort:", resp_json)
+            ai_text = SUMMARY_ERROR
+    except Exception as e:
+        print(f"Fehler beim Generieren der AI-Zusammenfassung: {e}")
+        ai_text = SUMMARY_ERROR
+    return ai_text
+
+
+# Erzeugt die Zusammenfassung in einem Hintergrund-Thread, während die Charts veröffentlicht werden.
+# Die Anfrage an das Modell endet spätestens mit der Frist; ein trotzdem verspätetes Ergebnis wird
+# verworfen, damit es nicht die Datei eines späteren Laufs überschreibt.
+class SummaryJob:
+    def __init__(self, data_list, stats=None, deadline=AI_SUMMARY_DEADLINE):
+        self.started = time.monotonic()
+        self.deadline = deadline
+        self.text = None
+        self.abandoned = False
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        # Daemon-Thread: ein hängendes Modell hält das Programmende nicht auf
+        self.thread = threading.Thread(target=self._run, args=(data_list, stats), daemon=True)
+        self.thread.start()
+
+    def _run(self, data_list, stats):
+        try:
+            text = generate_ai_summary(data_list, stats, self.started + self.deadline)
+            with self.lock:
+                if text is not None and not self.abandoned:
+                    _write_summary(text)
+                    self.text = text
+        except Exception as e:
+            print(f"Fehler beim Generieren der AI-Zusammenfassung: {e}")
+        finally:
+            self.done.set()
+
+    # Wartet höchstens bis zur Frist (ab Start gerechnet); danach gilt die letzte vorhandene Zusammenfassung
+    def result(self):
+        remaining = max(0.0, self.deadline - (time.monotonic() - self.started))
+        if not self.done.wait(remaining):
+            with self.lock:
+                self.abandoned = True
+            print(f"⏱️ AI-Zusammenfassung nach {self.deadline:.0f} s nicht fertig, nutze die letzte vorhandene")
+            return read_ai_summary()
+        return self.text if self.text is not None else read_ai_summary()
+
+
+def start_ai_summary(data_list, stats=None):
+    return SummaryJob(data_list, stats)
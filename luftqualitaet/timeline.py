@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+
+import pandas as pd
+
+from luftqualitaet.history import HistoryStore
+from luftqualitaet.output import temp_name
+
+
+# Vorpivotierte Zeitreihe (Zeitpunkt x Stadt) mit der Commit-Nummer des zuletzt übernommenen Batches.
+# Jeder Lauf mischt nur die seitdem geschriebenen Messungen ein, statt die gesamte Historie neu zu pivotieren.
+class TimelineState:
+    def __init__(self, path="data/timeline/aqi.parquet", value="aqi"):
+        self.path = path
+        self.meta_path = f"{path}.json"
+        self.value = value
+        self.pivot = None
+        self.watermark = None
+        self.sequence = None
+
+    def load(self):
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.pivot = pd.read_parquet(self.path)
+            self.watermark = pd.Timestamp(meta["watermark"]) if meta.get("watermark") else None
+            self.sequence = meta.get("sequence")
+            return True
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(self.meta_path) or os.path.exists(self.path):
+                print(f"⚠️ Zeitreihen-Zustand {self.path} nicht lesbar: {e}")
+            self.pivot = None
+            self.watermark = None
+            self.sequence = None
+            return False
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = temp_name(self.path)
+        self.pivot.to_parquet(tmp_path)
+        os.replace(tmp_path, self.path)
+        tmp_meta = temp_name(self.meta_path)
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({"watermark": self.watermark.isoformat() if self.watermark is not None else None,
+                       "sequence": self.sequence, "value": self.value}, f)
+        os.replace(tmp_meta, self.meta_path)
+
+    def _pivot(self, rows):
+        pivot = rows.pivot_table(index="timestamp", columns="city", values=self.value)
+        pivot.columns = pivot.columns.astype(str)
+        return pivot
+
+    # Baut den Zustand vollständig aus der Rohhistorie neu auf (Wiederherstellung)
+    def rebuild(self, store):
+        # Nummer vor dem Lesen: spätere Commits werden beim nächsten Lauf (erneut) übernommen
+        self.sequence = store.sequence()
+        rows = store.read(columns=["timestamp", "city", self.value])
+        self.pivot = self._pivot(rows).sort_index()
+        self.watermark = rows["timestamp"].max() if not rows.empty else None
+        self.save()
+        print(f"♻️ Zeitreihe {self.value} neu aufgebaut ({len(self.pivot)} Zeitpunkte)")
+        return self.pivot
+
+    # Übernimmt alle seit dem letzten Lauf geschriebenen Messungen und gibt die aktuelle Zeitreihe zurück
+    def update(self, store):
+        if self.pivot is None and not self.load():
+            return self.rebuild(store)
+        # Zustand aus der Zeit vor den Commit-Nummern
+        if self.sequence is None:
+            return self.rebuild(store)
+
+        rows, sequence = store.read_since(self.sequence, columns=["timestamp", "city", self.value])
+        if sequence == self.sequence:
+            return self.pivot
+        self.sequence = sequence
+        if not rows.empty:
+            new_pivot = self._pivot(rows)
+            if self.pivot.empty or new_pivot.index.min() > self.pivot.index.max():
+                # Üblicher Fall: alle neuen Zeitpunkte liegen nach dem letzten und werden nur angehängt
+                pivot = pd.concat([self.pivot, new_pivot])
+            else:
+                # Verspätet geschriebene ältere Messungen einsortieren; vorhandene Werte gewinnen wie bei
+                # der Kompaktierung der Historie
+                pivot = self.pivot.combine_first(new_pivot)
+            self.pivot = pivot.reindex(sorted(pivot.columns), axis=1)
+            self.watermark = self.pivot.index.max()
+        self.save()
+        return self.pivot
+
+
+if __name__ == "__main__":
+    # python -m luftqualitaet.timeline rebuild [historie] [zustand]
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Verwendung: python -m luftqualitaet.timeline rebuild [data/history] [data/timeline/aqi.parquet]")
+        sys.exit(1)
+    root = sys.argv[2] if len(sys.argv) > 2 else "data/history"
+    path = sys.argv[3] if len(sys.argv) > 3 else "data/timeline/aqi.parquet"
+    TimelineState(path).rebuild(HistoryStore(root))
@@ -0,0 +1,52 @@
+import base64
+import hashlib
+import os
+
+from luftqualitaet.output import STATIC_DIR, publish_asset
+
+
+# Leaflet liegt fest versioniert im Repository (luftqualitaet/static/leaflet/) und wird ohne Netzzugriff
+# als eigenes Asset ausgeliefert. Die Dateien entsprechen byteweise dem offiziellen Release (dist/),
+# die Prüfsummen sind die veröffentlichten SRI-Werte bzw. die der Bilder aus demselben Release.
+LEAFLET_VERSION = "1.9.4"
+LEAFLET_DIR = os.path.join(STATIC_DIR, "leaflet")
+LEAFLET_FILES = {
+    "leaflet.js": "sha256-20nQCchB9co0qIjJZRGuk2/Z9VM+kNiyxNV1lvTlZBo=",
+    "leaflet.css": "sha256-p4NxAoJBhIIN+hmNHrzRCf9tD/miZyoHS5obTRR9BMY=",
+    "images/layers.png": "sha256-Hbvp0CjikvNvy6j4s6KNXokydU/CIVuaxp5M3s9RB8Y=",
+    "images/layers-2x.png": "sha256-Bm2sqFDY/77wB68AsG6sABVyje4nnFHzy2xxbffELt8=",
+    "images/marker-icon.png": "sha256-V0w6XMqF9BFAhbaEFZbWLwDXyJLHsD8oy/owHesdxDc=",
+    "images/marker-icon-2x.png": "sha256-ABecTB7oMNOhCEEq4NKU9Vd2z+sIXGASmjmqb8SuJSg=",
+    "images/marker-shadow.png": "sha256-Jk9cZAM58ELdcpBiz8BMF/jqDymIK1OOOEjtjxDttNo=",
+}
+
+
+def _integrity(content):
+    return "sha256-" + base64.b64encode(hashlib.sha256(content).digest()).decode("ascii")
+
+
+def _read(name):
+    with open(os.path.join(LEAFLET_DIR, name), "rb") as f:
+        content = f.read()
+    if _integrity(content) != LEAFLET_FILES[name]:
+        raise ValueError(f"Leaflet {LEAFLET_VERSION}: Prüfsumme von {name} stimmt nicht")
+    return content
+
+
+# Liefert je Datei {"url": ..., "integrity": ...}; integrity ist die SRI-Prüfsumme des ausgelieferten Inhalts.
+# Die Bilder werden ebenfalls mit Inhaltshash veröffentlicht und in leaflet.css auf ihre Asset-Namen
+# umgeschrieben (alles liegt flach in assets/), deshalb weicht die Prüfsumme der CSS vom Release ab.
+# Die Karte nutzt nur circleMarker, die Standard-Icons (Pfaderkennung über marker-icon.png) werden nicht gebraucht.
+def leaflet_assets():
+    assets = {}
+    css = _read("leaflet.css")
+    for name in LEAFLET_FILES:
+        if not name.startswith("images/"):
+            continue
+        content = _read(name)
+        url = publish_asset(os.path.basename(name), content)
+        css = css.replace(f"url({name})".encode("ascii"), f"url({os.path.basename(url)})".encode("ascii"))
+        assets[name] = {"url": url, "integrity": LEAFLET_FILES[name]}
+    assets["leaflet.css"] = {"url": publish_asset("leaflet.css", css), "integrity": _integrity(css)}
+    assets["leaflet.js"] = {"url": publish_asset("leaflet.js", _read("leaflet.js")), "integrity": LEAFLET_FILES["leaflet.js"]}
+    return assets
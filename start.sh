@@ -1,16 +1,17 @@
 #!/bin/sh
 
-echo "🔄 Starte initialen Datenerhebungslauf..."
-python3 /datawrapper.py
-
-(
-  while true; do
-    echo "🕒 Warte 3 Stunden bis zum nächsten Lauf..."
-    sleep 1080  # 3 Stunden = 3*60*60 Sekunden
-    echo "🔄 Starte erneuten Datenerhebungslauf..."
-    python3 /datawrapper.py
-  done
-) &
+# Der Sammler bleibt resident und plant Sammeln, Veröffentlichen und Rendern selbst ein
+# (Intervalle über COLLECT_INTERVAL / PUBLISH_INTERVAL / RENDER_INTERVAL, Standard 1080 s = 18 Minuten)
+echo "🔄 Starte Datensammler im Daemon-Modus..."
+python3 /datawrapper.py --daemon &
+COLLECTOR_PID=$!
 
 echo "🚀 Starte NGINX Webserver..."
-nginx -g 'daemon off;'
+nginx -g 'daemon off;' &
+NGINX_PID=$!
+
+# docker stop: SIGTERM an Sammler und NGINX weiterreichen, damit beide sauber beenden
+trap 'kill -TERM $COLLECTOR_PID $NGINX_PID 2>/dev/null' TERM INT
+wait $NGINX_PID
+kill -TERM $COLLECTOR_PID 2>/dev/null
+wait $COLLECTOR_PID